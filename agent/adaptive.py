@@ -0,0 +1,96 @@
+# agent/adaptive.py
+
+import bisect
+import math
+
+from question_bank import question_difficulty
+
+MAX_SCORE = 10
+K_START = 1.0                # Ability step size for the first answer (logits)
+K_MIN = 0.25                 # Step size never shrinks below this
+
+
+# -------------------------
+# Ability estimate (Rasch model, Elo-style updates)
+# -------------------------
+def expected_score(ability, difficulty):
+    """Probability of a full-credit answer under the Rasch (1PL) model"""
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+class AbilityEstimate:
+    """
+    Running estimate of a candidate's ability on the question-difficulty
+    scale. Each answer moves the estimate by K * (observed - expected),
+    where observed is the score as a fraction of full marks; K shrinks as
+    answers accumulate so the estimate settles.
+    """
+
+    def __init__(self, ability=0.0, k_start=K_START, k_min=K_MIN):
+        self.ability = ability
+        self.k_start = k_start
+        self.k_min = k_min
+        self.answers = 0
+        self.information = 0.0       # Sum of Fisher information of asked questions
+
+    def update(self, difficulty, score, max_score=MAX_SCORE):
+        observed = min(1.0, max(0.0, score / max_score))
+        expected = expected_score(self.ability, difficulty)
+        k = max(self.k_min, self.k_start / math.sqrt(1 + self.answers))
+
+        self.information += expected * (1.0 - expected)
+        self.ability += k * (observed - expected)
+        self.answers += 1
+        return self.ability
+
+    @property
+    def standard_error(self):
+        """Approximate standard error of the estimate (inf before any answer)"""
+        return 1.0 / math.sqrt(self.information) if self.information else math.inf
+
+
+# -------------------------
+# Max-information selection
+# -------------------------
+class DifficultyIndex:
+    """
+    Unused question IDs sorted by difficulty. Under the Rasch model a
+    question is most informative when its difficulty equals the ability,
+    so the nearest difficulty is found by binary search.
+    """
+
+    def __init__(self, questions, rng):
+        # Random tie-break keeps equal difficulties in a seeded order
+        self._entries = sorted(
+            (question_difficulty(q) if isinstance(q, dict) else 0.0, rng.random(), qid)
+            for qid, q in enumerate(questions)
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _nearest(self, ability):
+        i = bisect.bisect_left(self._entries, (ability,))
+        if i == len(self._entries) or (
+            i > 0 and ability - self._entries[i - 1][0] <= self._entries[i][0] - ability
+        ):
+            i -= 1
+        return i
+
+    def nearest_difficulty(self, ability):
+        """Difficulty take_nearest() would pick, without taking it (None if empty)"""
+        if not self._entries:
+            return None
+        return self._entries[self._nearest(ability)][0]
+
+    def take_nearest(self, ability):
+        """Remove and return the ID whose difficulty is closest to ability"""
+        if not self._entries:
+            return None
+        return self._entries.pop(self._nearest(ability))[2]
+
+    def put_back(self, questions, qid, rng):
+        """Return an ID that was taken but not asked"""
+        q = questions[qid]
+        entry = (question_difficulty(q) if isinstance(q, dict) else 0.0, rng.random(), qid)
+        bisect.insort(self._entries, entry)
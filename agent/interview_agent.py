@@ -1,19 +1,31 @@
 # agent/interview_agent.py
 
+import os
 import random
 from pathlib import Path
 import json
 
+from agent.adaptive import AbilityEstimate, DifficultyIndex
+from question_bank import (
+    ROLES_FILE, QuestionBank, compile_bank, get_question_bank, question_difficulty
+)
+
 # -------------------------
 # Load roles and questions
 # -------------------------
-def load_roles(file_path="data/roles.json"):
-    """Load all roles and their questions from JSON"""
+def load_roles(file_path=ROLES_FILE):
+    """Load all roles and their (typed) questions"""
     if not Path(file_path).exists():
         raise FileNotFoundError(f"{file_path} not found.")
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data["roles"]
+    if os.path.abspath(file_path) == ROLES_FILE:
+        bank = get_question_bank()
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            bank = QuestionBank(compile_bank(json.load(f)))
+    return {
+        role: {"level": spec["level"], "questions": bank.questions(role=role)}
+        for role, spec in bank.roles.items()
+    }
 
 # -------------------------
 # Interview Agent Class
@@ -22,46 +34,100 @@ class InterviewAgent:
     """
     Handles adaptive question selection for the AI Smart Interview Coach
     Tracks answered questions and scores
+
+    With adaptive=True each recorded score updates an ability estimate and
+    the next question is the unused one whose difficulty is closest to it
+    (the most informative one). With target_se set, the session ends early
+    once the estimate is that precise (after min_questions answers).
     """
 
-    def __init__(self, role_name, max_questions=5):
-        self.roles = load_roles()
-        if role_name not in self.roles:
-            raise ValueError(f"Role '{role_name}' not found in roles.json")
+    def __init__(self, role_name, max_questions=5, seed=None, adaptive=False,
+                 target_se=None, min_questions=3):
+        # Shared, pre-indexed bank: no file parsing per agent
+        bank = get_question_bank()
+        if role_name not in bank.roles:
+            raise ValueError(f"Role '{role_name}' not found in the question bank")
 
         self.role_name = role_name
-        self.all_questions = self.roles[role_name]["questions"]
+        self.level = bank.roles[role_name]["level"]
+        self.all_questions = bank.questions(role=role_name)
         self.max_questions = min(max_questions, len(self.all_questions))
-        self.answered_questions = []
+        self.answered_questions = []  # IDs (positions in the active pool)
         self.current_index = 0
+        self._lookahead = None  # Question ID reserved by peek_next_question()
+        self._rng = random.Random(seed)  # Same seed -> same question order
+        self.adaptive = adaptive
+        self.target_se = target_se
+        self.min_questions = min_questions
+        self.ability = AbilityEstimate()
 
         # ✅ NEW (does not affect old logic)
         self.custom_questions = []
         self.use_custom_questions = False
+        self._reset_pool()
 
     def get_next_question(self):
         """
         Return the next question text and type.
         Handles both dict-based and string-based questions.
         """
+        if not self.has_more_questions():
+            return None, None  # No more questions
 
-        # ✅ NEW: Use resume-based questions if loaded
-        question_pool = (
-            self.custom_questions if self.use_custom_questions else self.all_questions
-        )
+        # A question picked ahead of time by peek_next_question() comes first
+        question_id = self._lookahead if self._lookahead is not None else self._pick_question()
+        self._lookahead = None
+        if question_id is None:
+            return None, None
 
-        remaining_questions = [
-            q for q in question_pool if q not in self.answered_questions
-        ]
+        self.answered_questions.append(question_id)
+        self.current_index += 1
+        return self._describe(self.question_by_id(question_id))
 
-        if not remaining_questions or self.current_index >= self.max_questions:
-            return None, None  # No more questions
+    def peek_next_question(self):
+        """
+        Pick the question that get_next_question() will return next,
+        without asking it, so the app can prepare for it in advance.
+        Returns (None, None) when the session has no more questions.
+        """
+        if not self.has_more_questions():
+            return None, None
+        if self._lookahead is None:
+            self._lookahead = self._pick_question()
+        if self._lookahead is None:
+            return None, None
+        return self._describe(self.question_by_id(self._lookahead))
+
+    def question_by_id(self, question_id):
+        """Question object for an ID from answered_questions"""
+        return self._active_pool()[question_id]
+
+    def _active_pool(self):
+        # ✅ NEW: Use resume-based questions if loaded
+        return self.custom_questions if self.use_custom_questions else self.all_questions
 
-        # Pick a random question
-        question_obj = random.choice(remaining_questions)
-        self.answered_questions.append(question_obj)
-        self.current_index += 1
+    def _reset_pool(self):
+        """Every ID of the active pool becomes available again"""
+        if self.adaptive:
+            self._unused = DifficultyIndex(self._active_pool(), self._rng)
+        else:
+            self._unused = list(range(len(self._active_pool())))
 
+    def _pick_question(self):
+        """
+        Take the next unused ID: the nearest difficulty when adaptive,
+        otherwise a random one in O(1) (swap it with the last one and pop)
+        """
+        if self.adaptive:
+            return self._unused.take_nearest(self.ability.ability)
+        if not self._unused:
+            return None
+        i = self._rng.randrange(len(self._unused))
+        self._unused[i], self._unused[-1] = self._unused[-1], self._unused[i]
+        return self._unused.pop()
+
+    @staticmethod
+    def _describe(question_obj):
         # If question is a dict with "question" and "type"
         if isinstance(question_obj, dict):
             q_text = question_obj.get("question", str(question_obj))
@@ -74,12 +140,47 @@ class InterviewAgent:
 
     def has_more_questions(self):
         """Check if there are more questions left"""
-        return self.current_index < self.max_questions
+        if self.current_index >= self.max_questions:
+            return False
+        # Stop early once the ability estimate is precise enough
+        return not (
+            self.target_se is not None
+            and self.ability.answers >= self.min_questions
+            and self.ability.standard_error <= self.target_se
+        )
+
+    def record_score(self, score, max_score=10):
+        """
+        Update the ability estimate with the score of the last asked
+        question (e.g. evaluate_answer()["score"]). Returns the new estimate.
+
+        A question already peeked is kept (so work prefetched for it is
+        not wasted) unless an unused one is now strictly closer to the
+        new estimate; it is then swapped right away, so check
+        peek_next_question() again before preparing the next question.
+        """
+        if not self.answered_questions:
+            return self.ability.ability
+        q = self.question_by_id(self.answered_questions[-1])
+        difficulty = question_difficulty(q) if isinstance(q, dict) else 0.0
+        ability = self.ability.update(difficulty, score, max_score)
+
+        if self.adaptive and self._lookahead is not None:
+            peeked = self.question_by_id(self._lookahead)
+            peeked = question_difficulty(peeked) if isinstance(peeked, dict) else 0.0
+            nearest = self._unused.nearest_difficulty(ability)
+            if nearest is not None and abs(nearest - ability) < abs(peeked - ability):
+                self._unused.put_back(self._active_pool(), self._lookahead, self._rng)
+                self._lookahead = self._pick_question()
+        return ability
 
     def reset_session(self):
         """Reset the interview session"""
         self.answered_questions = []
         self.current_index = 0
+        self._lookahead = None
+        self.ability = AbilityEstimate()
+        self._reset_pool()
 
     def summary(self):
         """Return a summary of the session"""
@@ -88,6 +189,9 @@ class InterviewAgent:
             "total_questions": self.max_questions,
             "answered_count": self.current_index,
             "answered_questions": self.answered_questions,
+            "ability": round(self.ability.ability, 2),
+            "ability_se": round(self.ability.standard_error, 2),
+            "questions": [self._describe(self.question_by_id(i))[0] for i in self.answered_questions],
         }
 
     # =====================================================
@@ -97,11 +201,15 @@ class InterviewAgent:
         """
         Load resume-based questions dynamically.
         This DOES NOT affect role-based logic.
+        Plain strings become {"question": ..., "type": "general"}.
         """
         if not questions:
             return
 
-        self.custom_questions = questions
+        self.custom_questions = [
+            {"question": q, "type": "general"} if isinstance(q, str) else q
+            for q in questions
+        ]
         self.use_custom_questions = True
         self.max_questions = min(self.max_questions, len(questions))
         self.reset_session()
@@ -7,50 +7,61 @@
 # -------------------------
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
 import time
 import cv2
-import pyttsx3
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 
 # -------------------------
 # Internal App Imports
 # -------------------------
 from styles import AppTheme
-from speech_to_text import listen_to_user
+from speech_to_text import BackgroundListener
+from text_to_speech import SpeechQueue
 from camera_analysis import (
     start_camera,
     stop_camera,
     get_live_camera_feedback,
-    get_camera_frame
+    get_camera_frame_if_new,
+    release_camera_frame
 )
+from emotion_model import warm_up_emotion_model
 from utils import timer
 from agent.interview_agent import InterviewAgent
 from interview_engine import evaluate_answer
+from eval_cache import get_eval_cache
+from semantic_scorer import get_semantic_scorer, warm_up_semantic_scorer
+from rubric import get_rubric_book
+from llm_backend import BackgroundLoop, get_llm_evaluator
 
 # Resume modules
-from resume_parser import extract_resume_text
-from resume_analyzer import extract_skills
-from resume_question_gen import generate_questions
+from resume_service import ResumeProcessor
 
 # -------------------------
 # Global Application State
 # -------------------------
 current_q_type = "definition"
-engine = pyttsx3.init()
+current_question = None
+tts = SpeechQueue()  # Background TTS worker (never blocks the UI)
+listener = BackgroundListener()  # Persistent microphone + recognizer
 
 session_score = 0
 questions_answered = 0
 total_questions = 5
 time_per_question = 60
+use_semantic_scoring = True  # Blend reference-answer similarity into scores
+llm_loop = None  # asyncio loop for the optional LLM coach (LLM_BASE_URL)
+coach_stream = 0  # Current coach feedback stream; older ones are ignored
 
 timer_id = None
+answer_session = None  # Listener session transcribing the current answer
+FINAL_TRANSCRIPT_TIMEOUT_MS = 10000  # Score the answer box if recognition hangs
 agent = None
 camera_preview = None
 role_var = None
 
 resume_uploaded = False
 resume_questions = []
+resume_processor = ResumeProcessor()  # Background parsing + hash-keyed cache
 
 # -------------------------
 # Styling Helpers
@@ -106,8 +117,29 @@ def style_text(widget):
 # -------------------------
 
 class CameraPreview:
+    """
+    Live camera preview rendered on the Tk main thread via after().
+    The refresh delay adapts: it backs off while frames are unchanged,
+    drops to an idle rate while the window is hidden, and slows down
+    when the UI thread falls behind schedule.
+    """
+
+    MIN_DELAY_MS = 33      # ~30 FPS when new frames keep arriving
+    MAX_DELAY_MS = 250     # ~4 FPS when frames are unchanged / UI is busy
+    IDLE_DELAY_MS = 1000   # Window minimized or hidden
+
     def __init__(self, parent):
         self.running = True
+        self.frame_seq = 0        # Sequence number of the frame on screen
+        self.feedback_shown = None
+
+        # Adaptive scheduling & render stats
+        self.delay_ms = self.MIN_DELAY_MS
+        self.render_ms = 0.0      # Render time of the last frame
+        self.avg_render_ms = 0.0  # Moving average render time
+        self.frames_rendered = 0
+        self._after_id = None
+        self._due = None          # When the next tick was scheduled to run
 
         self.frame = tk.Frame(parent, bg=AppTheme.BG_LIGHT, bd=1, relief="solid")
         self.frame.pack(pady=10)
@@ -125,51 +157,119 @@ class CameraPreview:
         )
         self.feedback.pack(fill="x")
 
-        threading.Thread(target=self.update, daemon=True).start()
+        self._schedule(self.delay_ms)
+
+    def _schedule(self, delay_ms):
+        """Queue the next update on the Tk event loop"""
+        self.delay_ms = int(delay_ms)
+        self._due = time.perf_counter() + self.delay_ms / 1000
+        self._after_id = self.video.after(self.delay_ms, self.update)
 
     def update(self):
-        while self.running:
-            frame = get_camera_frame()
-            cam = get_live_camera_feedback()
+        if not self.running:
+            return
+
+        # How late did this tick run? (UI thread busy elsewhere)
+        lag_ms = max(0.0, (time.perf_counter() - self._due) * 1000)
+
+        # Window minimized / hidden: nothing to draw, poll slowly
+        if not self.video.winfo_viewable():
+            self._schedule(self.IDLE_DELAY_MS)
+            return
+
+        # Skip resize/convert/PhotoImage when the frame hasn't changed
+        seq, frame = get_camera_frame_if_new(self.frame_seq, lease=True)
+        cam = get_live_camera_feedback()
+
+        if frame is not None:
+            start = time.perf_counter()
+            self.frame_seq = seq
+            try:
+                small = cv2.resize(frame, (240, 180))  # New array; lease ends here
+            finally:
+                release_camera_frame(frame)
+            frame = small
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            img = ImageTk.PhotoImage(Image.fromarray(frame))
+            self.video.imgtk = img
+            self.video.config(image=img)
+
+            self.render_ms = (time.perf_counter() - start) * 1000
+            self.avg_render_ms = (
+                self.render_ms if self.frames_rendered == 0
+                else 0.9 * self.avg_render_ms + 0.1 * self.render_ms
+            )
+            self.frames_rendered += 1
+            delay = self.MIN_DELAY_MS
+        else:
+            # No new frame: back off gradually
+            delay = self.delay_ms * 1.5
+
+        if cam["feedback"] != self.feedback_shown:
+            self.feedback_shown = cam["feedback"]
+            self.feedback.config(text=f"💭 {cam['feedback']}")
 
-            if frame is not None:
-                frame = cv2.resize(frame, (240, 180))
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = ImageTk.PhotoImage(Image.fromarray(frame))
-                self.video.imgtk = img
-                self.video.config(image=img)
+        # UI thread falling behind, or rendering eating the frame budget: slow down
+        if lag_ms > self.delay_ms or self.avg_render_ms > delay / 2:
+            delay = max(delay, self.delay_ms + lag_ms, self.avg_render_ms * 2)
 
-            self.feedback.config(text=f"💭 {cam['feedback']}")
-            time.sleep(0.03)
+        self._schedule(min(max(delay, self.MIN_DELAY_MS), self.MAX_DELAY_MS))
+
+    def get_render_stats(self):
+        """Return preview render timing for diagnostics"""
+        return {
+            "frames_rendered": self.frames_rendered,
+            "render_ms": round(self.render_ms, 2),
+            "avg_render_ms": round(self.avg_render_ms, 2),
+            "preview_fps": round(1000 / self.delay_ms, 1)
+        }
 
     def stop(self):
         self.running = False
+        if self._after_id is not None:
+            try:
+                self.video.after_cancel(self._after_id)
+            except tk.TclError:
+                pass  # Widget already destroyed
+            self._after_id = None
 
 # -------------------------
 # Resume Upload Logic
 # -------------------------
 
 def upload_resume():
-    global resume_uploaded, resume_questions
-
     file_path = filedialog.askopenfilename(
         filetypes=[("Resume Files", "*.pdf *.docx")]
     )
     if not file_path:
         return
 
-    try:
-        text = extract_resume_text(file_path)
-        skills = extract_skills(text)
-        resume_questions = generate_questions(skills)
-        resume_uploaded = True
-
-        messagebox.showinfo(
-            "Resume Processed",
-            f"Skills Detected:\n{', '.join(skills) if skills else 'General'}"
+    # Parsing runs on a worker thread; callbacks hop back to Tk with after()
+    def on_progress(stage, fraction):
+        progress_label.after(
+            0, lambda: progress_label.config(text=f"Resume: {stage} ({fraction:.0%})")
         )
-    except Exception as e:
-        messagebox.showerror("Resume Error", str(e))
+
+    def on_done(result):
+        progress_label.after(0, lambda: resume_processed(result))
+
+    def on_error(e):
+        progress_label.after(0, lambda: messagebox.showerror("Resume Error", str(e)))
+
+    resume_processor.submit(file_path, on_progress, on_done, on_error)
+
+def resume_processed(result):
+    global resume_uploaded, resume_questions
+
+    skills = result["skills"]
+    resume_questions = result["questions"]
+    resume_uploaded = True
+
+    progress_label.config(text=f"Question {questions_answered}/{total_questions}")
+    messagebox.showinfo(
+        "Resume Processed",
+        f"Skills Detected:\n{', '.join(skills) if skills else 'General'}"
+    )
 
 # -------------------------
 # Main Application UI
@@ -288,6 +388,12 @@ class InterviewCoachApp:
         )
 
     def on_close(self):
+        tts.shutdown()
+        listener.close()
+        resume_processor.shutdown()
+        get_eval_cache().close()
+        if llm_loop is not None:
+            llm_loop.stop()
         stop_camera()
         camera_preview.stop()
         self.root.destroy()
@@ -296,14 +402,15 @@ class InterviewCoachApp:
 # Interview Logic (UNCHANGED)
 # -------------------------
 
-def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+def speak(text, on_done=None, interrupt=False):
+    """Queue text on the TTS worker; on_done(utterance, completed) runs off the UI thread"""
+    return tts.say(text, on_done=on_done, interrupt=interrupt)
 
 def start_interview():
     global agent, questions_answered
+    tts.cancel_all()  # Drop speech left over from a previous interview
     questions_answered = 0
-    agent = InterviewAgent(role_var.get(), total_questions)
+    agent = InterviewAgent(role_var.get(), total_questions, adaptive=True)
 
     if resume_uploaded and resume_questions:
         agent.load_custom_questions(resume_questions)
@@ -312,7 +419,12 @@ def start_interview():
     next_question()
 
 def next_question():
-    global current_q_type, questions_answered, timer_id
+    global current_q_type, current_question, questions_answered, timer_id, answer_session
+
+    # Transcripts still arriving for the previous answer are ignored
+    answer_session = None
+    if listener.is_listening():
+        listener.stop()
 
     if not agent.has_more_questions():
         show_final_score()
@@ -320,6 +432,7 @@ def next_question():
 
     q, q_type = agent.get_next_question()
     current_q_type = q_type
+    current_question = q
 
     question_text.delete("1.0", tk.END)
     question_text.insert(tk.END, q)
@@ -327,30 +440,154 @@ def next_question():
     questions_answered += 1
     progress_label.config(text=f"Question {questions_answered}/{total_questions}")
 
-    speak(q)
+    # Start the countdown once the question has been read out (or speech
+    # failed or was cut off); start_question_timer ignores older questions
+    asked = questions_answered
+
+    def on_spoken(utterance, completed):
+        question_text.after(0, lambda: start_question_timer(asked))
+
+    speak(q, on_done=on_spoken)
+    prefetch_next_question()
+
+def prefetch_next_question():
+    """
+    While the current question is answered, pick the next one and warm
+    what it needs: its spoken audio, its rubric, the scorer and the LLM
+    connection. Submit then goes straight to feedback and the next question.
+    """
+    global llm_loop
+    q, q_type = agent.peek_next_question()
+    if q is None:
+        return
+
+    tts.presynthesize(q)
+    get_rubric_book().get(q, q_type)  # Compiles the type rubric on first use
+
+    evaluator = get_llm_evaluator()
+    if evaluator is not None:
+        if llm_loop is None:
+            llm_loop = BackgroundLoop()
+        llm_loop.submit(evaluator.warm_up())
+
+def start_question_timer(asked):
+    global timer_id
+    if asked != questions_answered:
+        return  # Candidate already moved on to another question
     timer_id = timer.start_timer(time_per_question, timer_label, submit_answer)
 
 def submit_answer():
     timer.stop_timer(timer_id)
-    answer = answer_text.get("1.0", tk.END)
+    if answer_session is None:
+        score_answer(answer_text.get("1.0", tk.END))
+        return
 
-    result = evaluate_answer(answer, current_q_type)
+    # Wait for the chunks still queued or being recognized before scoring
+    session = answer_session
+    listener.stop(on_final=lambda text, s: answer_text.after(0, lambda: finish_answer(s, text)))
+    answer_text.after(FINAL_TRANSCRIPT_TIMEOUT_MS, lambda: finish_answer(session, None))
+
+def finish_answer(session, transcript):
+    """Score a spoken answer once its final transcript is in (or on timeout)"""
+    global answer_session
+    if session != answer_session:
+        return  # Already scored, or the interview moved on
+    answer_session = None
+    if transcript is not None:
+        answer_text.delete("1.0", tk.END)
+        answer_text.insert("1.0", transcript)
+    score_answer(answer_text.get("1.0", tk.END))
+
+def score_answer(answer):
+
+    # Resubmitted answers are served from the evaluation cache
+    cache = get_eval_cache()
+    # None while the index is still loading or if it is unusable
+    scorer = get_semantic_scorer(block=False) if use_semantic_scoring else None
+    if scorer is not None:
+        result = cache.get_or_evaluate(
+            answer, current_q_type, current_question, scorer.evaluate, scorer.cache_tag
+        )
+    else:
+        result = cache.get_or_evaluate(answer, current_q_type, current_question, evaluate_answer)
+    # Steers the difficulty of the next question; keeps the prefetched one
+    # unless another question now fits the candidate better
+    agent.record_score(result["score"])
     cam = get_live_camera_feedback()
 
+    feedback = result["feedback"]
+    if result.get("missing") and result["score"] < 10:
+        feedback += f"\n💡 Consider mentioning: {', '.join(result['missing'][:3])}"
+
     feedback_text.delete("1.0", tk.END)
     feedback_text.insert(
         "1.0",
-        f"{result['feedback']}\n\n📹 Camera: {cam['feedback']}"
+        f"{feedback}\n\n📹 Camera: {cam['feedback']}"
     )
 
-    speak(result["feedback"])
+    # Feedback cuts off any question still being read out
+    speak(result["feedback"], interrupt=True)
+    stream_coach_feedback(current_question, answer, current_q_type)
     next_question()
 
+def stream_coach_feedback(question, answer, q_type):
+    """Append LLM coach feedback token by token, if an endpoint is configured"""
+    global llm_loop, coach_stream
+    evaluator = get_llm_evaluator()
+    if evaluator is None or question is None or not answer.strip():
+        return
+    if llm_loop is None:
+        llm_loop = BackgroundLoop()
+
+    coach_stream += 1
+    stream = coach_stream
+
+    def update(action):
+        def run():
+            if stream == coach_stream:  # Ignore streams for earlier answers
+                action()
+        feedback_text.after(0, run)
+
+    def on_token(token):
+        update(lambda: feedback_text.insert(tk.END, token))
+
+    def show_unavailable():
+        # Drop partial text so a cut-off stream never reads as complete feedback
+        feedback_text.delete("coach", tk.END)
+        feedback_text.insert(tk.END, "(unavailable)")
+
+    feedback_text.insert(tk.END, "\n\n🤖 Coach: ")
+    feedback_text.mark_set("coach", "end-1c")
+    feedback_text.mark_gravity("coach", tk.LEFT)
+
+    def on_done(future):
+        try:
+            result = future.result()
+        except Exception as e:
+            print("[LLM] Coach feedback failed:", e)
+            result = {}
+        if result.get("scorer") != "llm":
+            update(show_unavailable)
+
+    future = llm_loop.submit(evaluator.evaluate(question, answer, q_type, on_token=on_token))
+    future.add_done_callback(on_done)
+
 def speak_user_answer():
-    answer = listen_to_user()
-    if answer:
-        answer_text.delete("1.0", tk.END)
-        answer_text.insert("1.0", answer)
+    """Toggle background listening; partial transcripts stream into the answer box"""
+    global answer_session
+    if listener.is_listening():
+        listener.stop()
+        return
+
+    def show_transcript(text, session):
+        def update():
+            if session != answer_session:
+                return  # Late result for an earlier answer
+            answer_text.delete("1.0", tk.END)
+            answer_text.insert("1.0", text)
+        answer_text.after(0, update)
+
+    answer_session = listener.start(on_partial=show_transcript, on_final=show_transcript)
 
 def show_final_score():
     stop_camera()
@@ -362,6 +599,10 @@ def show_final_score():
 # -------------------------
 
 if __name__ == "__main__":
+    warm_up_emotion_model(background=True)  # Load emotion model while UI starts
+    if use_semantic_scoring:
+        warm_up_semantic_scorer(background=True)  # Reference index, off the Tk thread
+
     root = tk.Tk()
     app = InterviewCoachApp(root)
     root.mainloop()
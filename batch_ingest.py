@@ -0,0 +1,212 @@
+# batch_ingest.py
+
+"""
+Headless bulk resume ingestion.
+
+Walks a folder of PDF/DOCX resumes, runs the resume pipeline
+(text -> skills -> questions) across a process pool and streams one
+JSON record per file to a JSONL output. Re-running with the same
+output file skips resumes that were already processed. A file can have
+several records (--retry-errors appends a new one); the last one wins,
+as read_records() applies.
+
+Usage:
+    python batch_ingest.py resumes/ -o resumes.jsonl --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from resume_parser import extract_resume_text
+from resume_analyzer import extract_skills
+from resume_question_gen import generate_questions
+from resume_service import file_sha256
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+STAGES = ("hash", "extract_text", "extract_skills", "generate_questions")
+
+
+# -------------------------
+# Worker side
+# -------------------------
+def process_resume(file_path, include_text=False):
+    """Run the full pipeline on one file and return its JSONL record"""
+    record = {"path": file_path}
+    timings = {}
+    try:
+        start = time.perf_counter()
+        record["sha256"] = file_sha256(file_path)
+        timings["hash"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        text = extract_resume_text(file_path)
+        timings["extract_text"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        skills = extract_skills(text)
+        timings["extract_skills"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        questions = generate_questions(skills)
+        timings["generate_questions"] = time.perf_counter() - start
+
+        record["text_chars"] = len(text)
+        record["skills"] = skills
+        record["questions"] = questions
+        if include_text:
+            record["text"] = text
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["timings"] = timings
+    return record
+
+
+# -------------------------
+# Driver side
+# -------------------------
+def find_resumes(folder):
+    """Yield resume paths under folder, in a stable order"""
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def repair_output(output_path):
+    """Truncate a half-written last line left by an interrupted run"""
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        # Scan back from the end for the last complete line
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+
+
+def read_records(output_path):
+    """{path: record} from a JSONL output, keeping the last record for each path"""
+    records = {}
+    if not os.path.exists(output_path):
+        return records
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Half-written line from an interrupted run
+            records[record["path"]] = record
+    return records
+
+
+def load_done(output_path, retry_errors=False):
+    """Return the set of paths already recorded in an existing JSONL output"""
+    return {
+        path for path, record in read_records(output_path).items()
+        if not (retry_errors and "error" in record)
+    }
+
+
+def ingest(folder, output_path, workers=None, include_text=False,
+           retry_errors=False, max_in_flight=None):
+    """
+    Process every new resume under folder and append records to output_path.
+    Returns a stats dict (files, errors, skipped, seconds, files_per_sec, stage totals).
+    """
+    repair_output(output_path)  # Appending after a torn line would corrupt both records
+    done = load_done(output_path, retry_errors)
+    found = list(find_resumes(folder))
+    pending = [p for p in found if p not in done]
+    workers = workers or os.cpu_count()
+    max_in_flight = max_in_flight or workers * 4
+
+    stats = {
+        "files": 0,
+        "errors": 0,
+        "skipped": len(found) - len(pending),  # Only this folder's files
+        "stage_seconds": {stage: 0.0 for stage in STAGES}
+    }
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        paths = iter(pending)
+        in_flight = set()
+
+        while True:
+            # Keep a bounded number of files queued so huge folders don't pile up
+            for path in paths:
+                in_flight.add(executor.submit(process_resume, path, include_text))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()  # Each finished file survives an interruption
+
+                stats["files"] += 1
+                if "error" in record:
+                    stats["errors"] += 1
+                for stage, seconds in record["timings"].items():
+                    stats["stage_seconds"][stage] += seconds
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["files_per_sec"] = stats["files"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def print_report(stats):
+    """Print throughput and per-stage timings"""
+    print(f"Processed: {stats['files']} files ({stats['errors']} errors), "
+          f"skipped {stats['skipped']} already done")
+    print(f"Elapsed:   {stats['seconds']:.1f}s  ({stats['files_per_sec']:.2f} files/sec)")
+
+    if stats["files"]:
+        print("Per-stage time (total / avg per file):")
+        for stage in STAGES:
+            total = stats["stage_seconds"][stage]
+            print(f"  {stage:<20} {total:8.2f}s  {1000 * total / stats['files']:8.1f} ms")
+
+
+# -------------------------
+# Entry Point
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk resume ingestion to JSONL")
+    parser.add_argument("folder", help="Folder containing PDF/DOCX resumes")
+    parser.add_argument("-o", "--output", default="resumes.jsonl", help="JSONL output file")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--include-text", action="store_true", help="Store extracted text")
+    parser.add_argument("--retry-errors", action="store_true", help="Re-run files that failed")
+    args = parser.parse_args(argv)
+
+    stats = ingest(
+        args.folder,
+        args.output,
+        workers=args.workers,
+        include_text=args.include_text,
+        retry_errors=args.retry_errors
+    )
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
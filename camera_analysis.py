@@ -1,162 +1,588 @@
 # camera_analysis.py
 import cv2
-from deepface import DeepFace
+import numpy as np
 import threading
 import time
 import traceback
 
+from emotion_model import get_emotion_model
+from frame_buffer import FrameBuffer
+
+# -------------------------
+# Defaults
+# -------------------------
+DEFAULT_ANALYSIS_FPS = 3     # Emotion analysis ticks per second
+DEFAULT_MAX_BATCH = 8        # Max face crops per model call
+
+NO_FACE_FEEDBACK = "No face detected. Please sit in front of the camera."
+PREPARING_FEEDBACK = "Preparing emotion analysis..."
+
+# -------------------------
+# Face ROI pipeline settings
+# -------------------------
+DETECT_SCALE = 0.25          # Detect on a 160x120 copy of the 640x480 frame
+REDETECT_EVERY = 10          # Force a full detection every N analyses
+TRACK_MIN_MATCH = 0.6        # Template-match score below this = face lost
+FACE_SIZE = 96               # Side of the crop sent to the emotion model
+FACE_MARGIN = 0.15           # Extra context around the detected box
+
+
 # -------------------------
-# Global variables for live feedback
+# Emotion scoring
 # -------------------------
-live_camera_score = 0        # Score 0-10
-live_camera_feedback = ""    # Text feedback
-camera_running = False       # Flag to control camera thread
-latest_frame = None          # Latest frame for UI preview
-_lock = threading.Lock()     # Thread-safe lock for shared variables
+def _score_emotion(dominant_emotion):
+    """Map a dominant emotion to a (score, feedback) pair"""
+    # -------------------------
+    # Realistic scoring & feedback (UNCHANGED)
+    # -------------------------
+    if dominant_emotion == "happy":
+        score = 10
+        feedback = "You look confident and engaged!"
+    elif dominant_emotion == "neutral":
+        score = 6
+        feedback = "You look calm. Try to smile more for confidence."
+    elif dominant_emotion == "surprise":
+        score = 8
+        feedback = "You seem alert and attentive!"
+    elif dominant_emotion in ["sad", "angry", "fear", "disgust"]:
+        score = 3
+        feedback = f"Your emotion seems {dominant_emotion}. Try to smile more."
+    else:
+        score = 5
+        feedback = "Keep your focus and confidence high."
+    return score, feedback
 
 
 # -------------------------
-# Internal camera loop
+# Face detection & tracking
 # -------------------------
-def _camera_loop():
-    """Runs in background thread and updates live feedback"""
-    global live_camera_score, live_camera_feedback, camera_running, latest_frame
+_face_cascade = None
 
-    # ✅ FIX: Force DirectShow backend (Windows stable)
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
 
-    # Optional but safe stability settings (NO logic change)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
+def _get_face_cascade():
+    """Load the OpenCV Haar face detector once"""
+    global _face_cascade
+    if _face_cascade is None:
+        _face_cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+    return _face_cascade
 
-    if not cap.isOpened():
-        with _lock:
-            live_camera_score = 0
-            live_camera_feedback = "Cannot access camera"
-        camera_running = False
-        print("[Camera] ERROR: Cannot access camera")
-        return
 
-    camera_running = True
-    print("[Camera] Camera started successfully")
+class FaceTracker:
+    """
+    Finds the face on a downscaled grayscale frame and follows it with
+    template matching between detections, so the expensive detector
+    only runs every REDETECT_EVERY analyses or when the face is lost.
+    """
 
-    frame_fail_count = 0  # prevent console spam
+    def __init__(self, scale=DETECT_SCALE, redetect_every=REDETECT_EVERY):
+        self.scale = scale
+        self.redetect_every = redetect_every
+        self.box = None          # (x, y, w, h) in downscaled coordinates
+        self._template = None    # Grayscale face patch from the last update
+        self._since_detect = 0
 
-    while camera_running:
-        try:
-            ret, frame = cap.read()
+    def reset(self):
+        """Forget the current face"""
+        self.box = None
+        self._template = None
+        self._since_detect = 0
 
-            if not ret:
-                frame_fail_count += 1
-                if frame_fail_count % 30 == 0:
-                    print("[Camera] WARNING: Frame not received")
-                time.sleep(0.05)
-                continue
+    def _detect(self, small):
+        """Full face detection on the downscaled frame (largest face wins)"""
+        faces = _get_face_cascade().detectMultiScale(
+            small, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20)
+        )
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        return int(x), int(y), int(w), int(h)
+
+    def _track(self, small):
+        """Search for the previous face patch in a window around the old box"""
+        x, y, w, h = self.box
+        pad_x, pad_y = w // 2, h // 2
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1 = min(small.shape[1], x + w + pad_x)
+        y1 = min(small.shape[0], y + h + pad_y)
+        window = small[y0:y1, x0:x1]
+
+        if window.shape[0] < h or window.shape[1] < w:
+            return None
+
+        result = cv2.matchTemplate(window, self._template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val < TRACK_MIN_MATCH:
+            return None
+        return x0 + max_loc[0], y0 + max_loc[1], w, h
+
+    def update(self, frame):
+        """
+        Locate the face in a full-size BGR frame.
+        Returns (box, detected) where box is in full-frame coordinates
+        (or None) and detected tells whether the detector had to run.
+        """
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale,
+                           interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        box = None
+        detected = False
+        if self.box is not None and self._since_detect < self.redetect_every:
+            box = self._track(small)
+            self._since_detect += 1
+
+        if box is None:
+            box = self._detect(small)
+            detected = True
+            self._since_detect = 0
+
+        if box is None:
+            self.reset()
+            return None, detected
+
+        x, y, w, h = box
+        self.box = box
+        self._template = small[y:y + h, x:x + w].copy()
+
+        inv = 1.0 / self.scale
+        return (int(x * inv), int(y * inv), int(w * inv), int(h * inv)), detected
+
+
+def crop_face(frame, box, size=FACE_SIZE, margin=FACE_MARGIN):
+    """Cut the face box (plus a margin) out of the frame and resize it"""
+    x, y, w, h = box
+    mx, my = int(w * margin), int(h * margin)
+    x0, y0 = max(0, x - mx), max(0, y - my)
+    x1 = min(frame.shape[1], x + w + mx)
+    y1 = min(frame.shape[0], y + h + my)
+    return cv2.resize(frame[y0:y1, x0:x1], (size, size), interpolation=cv2.INTER_AREA)
+
+
+# -------------------------
+# Per-session camera analyzer
+# -------------------------
+class CameraAnalyzer:
+    """
+    One camera / candidate station.
+    Owns its capture thread, latest frame, face tracker, live score and
+    counters. Emotion inference is done by a shared InferenceWorker.
+    """
 
-            frame_fail_count = 0
-            frame = cv2.flip(frame, 1)  # Mirror effect
+    def __init__(self, camera_index=0, worker=None, name=None):
+        self.camera_index = camera_index
+        self.name = name or f"camera-{camera_index}"
+        self.worker = worker
+        self.running = False
+        self.tracker = FaceTracker()
 
-            # -------------------------
-            # Emotion detection
-            # -------------------------
-            score = 0
-            feedback = "No face detected. Please sit in front of the camera."
-            dominant_emotion = "neutral"
+        self.score = 0               # Score 0-10
+        self.feedback = ""           # Text feedback
+        self.frames = FrameBuffer()  # Latest frames for UI preview and analysis
+        self.analyzed_seq = 0        # Sequence number of the last analyzed frame
 
+        # Counters for sizing machines
+        self.frames_captured = 0
+        self.frames_analyzed = 0
+        self.frames_dropped = 0
+        self.faces_detected = 0      # Analyses that needed a full face detection
+        self.faces_tracked = 0       # Analyses served by the cheap tracker
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # -------------------------
+    # Capture side
+    # -------------------------
+    def start(self):
+        """Start the capture thread and join the shared inference worker"""
+        if self.running:
+            return
+        # A previous session may still be releasing the device
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        print(f"[Camera] Starting {self.name}...")
+
+    def stop(self):
+        """Stop the capture thread"""
+        self.running = False
+        print(f"[Camera] Stopping {self.name}...")
+
+    def _capture_loop(self):
+        """Runs in background thread and feeds the frame buffer at full FPS"""
+        worker = self.worker or get_inference_worker()
+
+        # ✅ FIX: Force DirectShow backend (Windows stable)
+        cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
+
+        # Optional but safe stability settings (NO logic change)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+
+        if not cap.isOpened():
+            with self._lock:
+                self.score = 0
+                self.feedback = "Cannot access camera"
+            self.running = False
+            print(f"[Camera] ERROR: Cannot access {self.name}")
+            return
+
+        with self._lock:
+            self.score = 0
+            self.feedback = (
+                NO_FACE_FEEDBACK if get_emotion_model().is_ready() else PREPARING_FEEDBACK
+            )
+            self.frames.clear()
+            self.analyzed_seq = self.frames.seq
+            self.frames_captured = 0
+            self.frames_analyzed = 0
+            self.frames_dropped = 0
+            self.faces_detected = 0
+            self.faces_tracked = 0
+        self.tracker.reset()
+
+        print(f"[Camera] {self.name} started successfully")
+        worker.register(self)
+
+        frame_fail_count = 0  # prevent console spam
+        raw = None            # Reused capture buffer
+
+        while self.running:
             try:
-                analysis = DeepFace.analyze(
-                    frame,
-                    actions=['emotion'],
-                    enforce_detection=False
-                )
-
-                # Handle list vs dict from DeepFace
-                if isinstance(analysis, list):
-                    analysis = analysis[0]
-
-                dominant_emotion = analysis.get("dominant_emotion", "neutral")
-                print(f"[Camera] Detected emotion: {dominant_emotion}")
-
-                # -------------------------
-                # Realistic scoring & feedback (UNCHANGED)
-                # -------------------------
-                if dominant_emotion == "happy":
-                    score = 10
-                    feedback = "You look confident and engaged!"
-                elif dominant_emotion == "neutral":
-                    score = 6
-                    feedback = "You look calm. Try to smile more for confidence."
-                elif dominant_emotion == "surprise":
-                    score = 8
-                    feedback = "You seem alert and attentive!"
-                elif dominant_emotion in ["sad", "angry", "fear", "disgust"]:
-                    score = 3
-                    feedback = f"Your emotion seems {dominant_emotion}. Try to smile more."
-                else:
-                    score = 5
-                    feedback = "Keep your focus and confidence high."
+                ret, raw = cap.read(raw)
+
+                if not ret:
+                    frame_fail_count += 1
+                    if frame_fail_count % 30 == 0:
+                        print(f"[Camera] WARNING: Frame not received from {self.name}")
+                    time.sleep(0.05)
+                    continue
+
+                frame_fail_count = 0
+                # Mirror effect, written straight into the next buffer slot
+                slot = self.frames.write_slot(raw.shape, raw.dtype)
+                cv2.flip(raw, 1, dst=slot)
+                self.frames.publish()
+
+                with self._lock:
+                    self.frames_captured += 1
 
             except Exception as e:
-                dominant_emotion = "neutral"
-                score = 0
-                feedback = "Face not detected or unclear."
-                print("[Camera] DeepFace analysis error:", e)
+                print(f"[Camera] {self.name} loop error:", e)
                 traceback.print_exc()
 
-            # -------------------------
-            # Update shared variables thread-safely
-            # -------------------------
-            with _lock:
-                live_camera_score = min(score, 10)
-                live_camera_feedback = feedback
-                latest_frame = frame.copy()
+        # -------------------------
+        # Cleanup
+        # -------------------------
+        worker.unregister(self)
+        cap.release()
+        self.running = False
+        with self._lock:
+            # Frames captured after the last analysis were never looked at
+            self.frames_dropped += max(0, self.frames.seq - self.analyzed_seq)
+            self.analyzed_seq = self.frames.seq
+        print(f"[Camera] {self.name} stopped")
 
-        except Exception as e:
-            print("[Camera] Camera loop error:", e)
-            traceback.print_exc()
+    # -------------------------
+    # Inference side (called by the worker thread)
+    # -------------------------
+    def has_new_frame(self):
+        """True if a frame newer than the last analyzed one is waiting"""
+        return self.frames.seq != self.analyzed_seq
+
+    def take_frame(self):
+        """
+        Claim (lease) the newest frame for analysis; older ones count as
+        dropped. Hand it back with release_frame() when done.
+        """
+        seq, frame = self.frames.read(since_seq=self.analyzed_seq, lease=True)
+        if frame is None:
+            return None
+        with self._lock:
+            self.frames_dropped += max(0, seq - self.analyzed_seq - 1)
+            self.analyzed_seq = seq
+        return frame
 
-        # Reduce CPU usage
-        time.sleep(0.03)
+    def release_frame(self, frame):
+        self.frames.release(frame)
+
+    def locate_face(self, frame):
+        """Run the tracker on a frame and return the cropped face (or None)"""
+        box, detected = self.tracker.update(frame)
+        with self._lock:
+            if detected:
+                self.faces_detected += 1
+            elif box is not None:
+                self.faces_tracked += 1
+        if box is None:
+            return None
+        return crop_face(frame, box)
+
+    def publish(self, score, feedback):
+        """Store the result of one analysis"""
+        with self._lock:
+            self.score = min(score, 10)
+            self.feedback = feedback
+            self.frames_analyzed += 1
 
     # -------------------------
-    # Cleanup
+    # Readers
     # -------------------------
-    cap.release()
-    camera_running = False
-    print("[Camera] Camera stopped")
+    def get_feedback(self):
+        """Return latest live feedback and score"""
+        with self._lock:
+            return {
+                "score": self.score,
+                "feedback": self.feedback
+            }
+
+    def get_frame(self):
+        """Return latest camera frame for UI preview (read-only view, no copy)"""
+        return self.frames.read()[1]
+
+    def get_frame_if_new(self, since_seq, lease=False):
+        """
+        Return (seq, frame); frame is None if nothing new since since_seq.
+        With lease=True, pass the frame to release_frame() when done.
+        """
+        return self.frames.read(since_seq=since_seq, lease=lease)
+
+    def get_stats(self):
+        """Return capture/analysis counters for capacity planning"""
+        with self._lock:
+            return {
+                "frames_captured": self.frames_captured,
+                "frames_analyzed": self.frames_analyzed,
+                "frames_dropped": self.frames_dropped,
+                "faces_detected": self.faces_detected,
+                "faces_tracked": self.faces_tracked
+            }
+
+
+# -------------------------
+# Shared inference worker
+# -------------------------
+class InferenceWorker:
+    """
+    One thread serving every active CameraAnalyzer.
+    Each tick it takes the newest frame from up to max_batch streams
+    (round-robin, so no stream starves when there are more streams than
+    batch slots), crops the faces and classifies them in one model call.
+    """
+
+    def __init__(self, analysis_fps=DEFAULT_ANALYSIS_FPS, max_batch=DEFAULT_MAX_BATCH):
+        self.analysis_fps = analysis_fps
+        self.max_batch = max_batch
+        self._streams = []
+        self._cursor = 0             # Round-robin start position
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Stats
+        self.ticks = 0
+        self.batches_run = 0
+        self.faces_classified = 0
+        self.last_batch_size = 0
+        self.last_batch_seconds = 0.0
+
+    def set_rate(self, fps):
+        """Set the target number of analysis ticks per second"""
+        self.analysis_fps = max(float(fps), 0.1)
+
+    def register(self, analyzer):
+        """Add a stream; starts the worker thread if needed"""
+        with self._lock:
+            if analyzer not in self._streams:
+                self._streams.append(analyzer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def unregister(self, analyzer):
+        """Remove a stream; the thread exits when no streams are left"""
+        with self._lock:
+            if analyzer in self._streams:
+                index = self._streams.index(analyzer)
+                self._streams.remove(analyzer)
+                if index < self._cursor:
+                    self._cursor -= 1
+
+    def _pick_streams(self):
+        """Round-robin selection of up to max_batch streams with new frames"""
+        with self._lock:
+            count = len(self._streams)
+            if count == 0:
+                return []
+            start = self._cursor % count
+            ordered = self._streams[start:] + self._streams[:start]
+
+            picked = []
+            last = start
+            for offset, analyzer in enumerate(ordered):
+                if len(picked) >= self.max_batch:
+                    break
+                if analyzer.has_new_frame():
+                    picked.append(analyzer)
+                    last = (start + offset) % count
+
+            # Next tick starts right after the last served stream
+            if picked:
+                self._cursor = (last + 1) % count
+            return picked
+
+    def run_once(self):
+        """Run one tick: collect crops, classify as one batch, publish results"""
+        self.ticks += 1
+        faces = []
+        owners = []
+
+        for analyzer in self._pick_streams():
+            frame = analyzer.take_frame()
+            if frame is None:
+                continue
+            try:
+                face = analyzer.locate_face(frame)  # The crop is a new array
+            except Exception as e:
+                print(f"[Camera] {analyzer.name} face tracking error:", e)
+                traceback.print_exc()
+                analyzer.publish(0, "Face not detected or unclear.")
+                continue
+            finally:
+                analyzer.release_frame(frame)
+
+            if face is None:
+                analyzer.publish(0, NO_FACE_FEEDBACK)
+                continue
+            faces.append(face)
+            owners.append(analyzer)
+
+        if not faces:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            results = get_emotion_model().classify_batch(faces)
+        except Exception as e:
+            print("[Camera] Emotion batch error:", e)
+            traceback.print_exc()
+            for analyzer in owners:
+                analyzer.publish(0, "Face not detected or unclear.")
+            return 0
+
+        self.batches_run += 1
+        self.faces_classified += len(faces)
+        self.last_batch_size = len(faces)
+        self.last_batch_seconds = time.perf_counter() - start
+
+        for analyzer, analysis in zip(owners, results):
+            dominant_emotion = analysis.get("dominant_emotion", "neutral")
+            score, feedback = _score_emotion(dominant_emotion)
+            analyzer.publish(score, feedback)
+        return len(faces)
+
+    def _run(self):
+        """Worker thread: warm up once, then tick at analysis_fps"""
+        model = get_emotion_model()
+        if not model.is_ready():
+            model.warm_up(background=False)
+
+        next_run = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._streams:
+                    self._thread = None
+                    return
+
+            try:
+                self.run_once()
+            except Exception as e:
+                print("[Camera] Inference worker error:", e)
+                traceback.print_exc()
+
+            # Rate limit: sleep until the next analysis slot
+            interval = 1.0 / max(self.analysis_fps, 0.1)
+            next_run = max(next_run + interval, time.monotonic())
+            time.sleep(max(0.0, next_run - time.monotonic()))
+
+    def get_stats(self):
+        """Return worker-level counters"""
+        with self._lock:
+            active_streams = len(self._streams)
+        return {
+            "active_streams": active_streams,
+            "analysis_fps": self.analysis_fps,
+            "max_batch": self.max_batch,
+            "ticks": self.ticks,
+            "batches_run": self.batches_run,
+            "faces_classified": self.faces_classified,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_seconds": self.last_batch_seconds
+        }
+
+
+_inference_worker = InferenceWorker()
+
+
+def get_inference_worker():
+    """Return the process-wide inference worker"""
+    return _inference_worker
 
 
 # -------------------------
-# Public functions
+# Public functions (single-camera app)
 # -------------------------
-def start_camera():
-    """Start camera thread"""
-    global camera_running
-    if not camera_running:
-        threading.Thread(target=_camera_loop, daemon=True).start()
-        print("[Camera] Starting camera thread...")
+_default_analyzer = CameraAnalyzer(0)
+
+
+def get_default_analyzer():
+    """Return the analyzer used by the desktop app"""
+    return _default_analyzer
+
+
+def start_camera(analysis_rate=None):
+    """Start camera thread (optionally with a new analyses-per-second target)"""
+    if analysis_rate is not None:
+        set_analysis_rate(analysis_rate)
+    _default_analyzer.start()
 
 
 def stop_camera():
     """Stop camera thread"""
-    global camera_running
-    camera_running = False
-    print("[Camera] Stopping camera thread...")
+    _default_analyzer.stop()
 
 
 def get_live_camera_feedback():
     """Return latest live feedback and score"""
-    with _lock:
-        return {
-            "score": live_camera_score,
-            "feedback": live_camera_feedback
-        }
+    return _default_analyzer.get_feedback()
+
+
+def set_analysis_rate(fps):
+    """Set the target number of emotion analyses per second"""
+    _inference_worker.set_rate(fps)
+
+
+def get_camera_stats():
+    """Return capture/analysis counters for capacity planning"""
+    stats = _default_analyzer.get_stats()
+    stats["analysis_fps"] = _inference_worker.analysis_fps
+    return stats
 
 
 def get_camera_frame():
-    """Return latest camera frame for UI preview"""
-    with _lock:
-        if latest_frame is not None:
-            return latest_frame.copy()
-        return None
+    """Return latest camera frame for UI preview (read-only view, no copy)"""
+    return _default_analyzer.get_frame()
+
+
+def get_camera_frame_if_new(since_seq, lease=False):
+    """Return (seq, frame) for the preview; frame is None if unchanged"""
+    return _default_analyzer.get_frame_if_new(since_seq, lease)
+
+
+def release_camera_frame(frame):
+    """Hand back a frame leased with get_camera_frame_if_new(lease=True)"""
+    _default_analyzer.release_frame(frame)
@@ -0,0 +1,165 @@
+# emotion_model.py
+
+import threading
+import time
+import traceback
+
+import cv2
+import numpy as np
+from deepface import DeepFace
+
+# Output order of the DeepFace emotion model
+EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+EMOTION_INPUT_SIZE = 48
+
+
+# -------------------------
+# Emotion Model Holder
+# -------------------------
+class EmotionModel:
+    """
+    Loads the DeepFace emotion model once per process and keeps it warm.
+    Shared by every camera session so start/stop cycles never reload it.
+    """
+
+    def __init__(self, detector_backend="opencv"):
+        self.detector_backend = detector_backend
+        self.model = None
+        self.load_seconds = None     # Time spent building the model
+        self.warmup_seconds = None   # Time spent on the first (dummy) inference
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._warm_thread = None
+
+    def is_ready(self):
+        """True once the model is built and a warm-up inference has run"""
+        return self._ready.is_set()
+
+    def load(self):
+        """Build the emotion model (no-op if already loaded)"""
+        if self.model is not None:
+            return self.model
+
+        with self._lock:
+            if self.model is None:
+                start = time.perf_counter()
+                try:
+                    # Newer DeepFace versions
+                    self.model = DeepFace.build_model(
+                        task="facial_attribute", model_name="Emotion"
+                    )
+                except TypeError:
+                    # Older DeepFace versions
+                    self.model = DeepFace.build_model("Emotion")
+                self.load_seconds = time.perf_counter() - start
+                print(f"[Emotion] Model loaded in {self.load_seconds:.2f}s")
+        return self.model
+
+    def warm_up(self, background=True):
+        """
+        Load the model and run one dummy inference so the detector
+        backend and model graph are initialized before the first real frame.
+        """
+        if self.is_ready():
+            return
+
+        if background:
+            if self._warm_thread is None or not self._warm_thread.is_alive():
+                self._warm_thread = threading.Thread(target=self._warm_up, daemon=True)
+                self._warm_thread.start()
+            return
+
+        # Warm-up already running in the background: just wait for it
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            self._warm_thread.join()
+            return
+
+        self._warm_up()
+
+    def _warm_up(self):
+        """Internal warm-up routine"""
+        try:
+            self.load()
+            start = time.perf_counter()
+            dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+            self.analyze(dummy)
+            self.classify_batch([dummy[:96, :96]])  # Batched path used by camera sessions
+            self.warmup_seconds = time.perf_counter() - start
+            self._ready.set()
+            print(f"[Emotion] Warm-up inference took {self.warmup_seconds:.2f}s")
+        except Exception as e:
+            print("[Emotion] Warm-up failed:", e)
+            traceback.print_exc()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until warm-up has finished (returns readiness)"""
+        return self._ready.wait(timeout)
+
+    def analyze(self, img, detector_backend=None):
+        """Run DeepFace emotion analysis using the shared, loaded model"""
+        self.load()
+        analysis = DeepFace.analyze(
+            img,
+            actions=['emotion'],
+            enforce_detection=False,
+            detector_backend=detector_backend or self.detector_backend,
+            silent=True
+        )
+
+        # Handle list vs dict from DeepFace
+        if isinstance(analysis, list):
+            analysis = analysis[0]
+        self._ready.set()
+        return analysis
+
+    def classify_batch(self, faces):
+        """
+        Classify already-cropped BGR face images in one model call.
+        Returns one analysis dict per face, shaped like DeepFace.analyze output.
+        """
+        if not faces:
+            return []
+
+        model = self.load()
+        # DeepFace wraps the Keras model in a client object on newer versions
+        keras_model = getattr(model, "model", model)
+
+        batch = np.empty(
+            (len(faces), EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 1), dtype=np.float32
+        )
+        for i, face in enumerate(faces):
+            gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+            gray = cv2.resize(gray, (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE))
+            batch[i, :, :, 0] = gray / 255.0
+
+        predictions = keras_model.predict(batch, verbose=0)
+        self._ready.set()
+
+        results = []
+        for row in predictions:
+            total = float(row.sum()) or 1.0
+            emotion = {
+                label: 100 * float(p) / total for label, p in zip(EMOTION_LABELS, row)
+            }
+            results.append({
+                "emotion": emotion,
+                "dominant_emotion": EMOTION_LABELS[int(row.argmax())]
+            })
+        return results
+
+
+# -------------------------
+# Process-wide instance
+# -------------------------
+_emotion_model = EmotionModel()
+
+
+def get_emotion_model():
+    """Return the process-wide emotion model holder"""
+    return _emotion_model
+
+
+def warm_up_emotion_model(background=True):
+    """Load the emotion model (and run a warm-up inference) at app start"""
+    _emotion_model.warm_up(background=background)
+    return _emotion_model
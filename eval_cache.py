@@ -0,0 +1,206 @@
+# eval_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from interview_engine import evaluate_answer
+from rubric import get_rubric_book, tokenize
+
+MAX_ENTRIES = 4096           # In-memory LRU size
+DEFAULT_TTL = None           # Seconds; None keeps entries until evicted
+CACHE_DB_ENV = "EVAL_CACHE_DB"
+
+def normalize_answer(answer):
+    """
+    Cache-key form of an answer: its rubric tokens. Answers share a key
+    only if the scorers see the same words ("return_value" stays one
+    token, "object-oriented" stays two).
+    """
+    return " ".join(tokenize(answer or ""))
+
+
+class EvalCache:
+    """
+    Caches evaluation results by (scorer, rubric version, type, question,
+    normalized answer). An in-memory LRU sits in front of an optional
+    SQLite file, so re-scoring runs and restarts can reuse results.
+    Entries for a question are dropped when its rubric is replaced; a
+    changed rubric also changes the key, so stale results are never served.
+    """
+
+    def __init__(self, db_path=None, max_entries=MAX_ENTRIES, ttl=DEFAULT_TTL, rubric_book=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.rubric_book = rubric_book or get_rubric_book()
+        self._memory = OrderedDict()      # key -> (stored_at, question, result json)
+        self._lock = threading.Lock()
+        self._db = None
+
+        # Stats
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if db_path:
+            self._open_db(db_path)
+        self.rubric_book.add_listener(self.invalidate_question)
+
+    def _open_db(self, db_path):
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS eval_cache ("
+            "key TEXT PRIMARY KEY, question TEXT, stored_at REAL, result TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS eval_cache_question ON eval_cache(question)")
+        self._db.commit()
+
+    # -------------------------
+    # Keys
+    # -------------------------
+    def make_key(self, answer, q_type="definition", question=None, scorer="keyword"):
+        rubric = self.rubric_book.get(question, q_type)
+        spec = "\x1f".join([scorer, rubric.version, q_type or "", question or "",
+                            normalize_answer(answer)])
+        return hashlib.sha1(spec.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    # -------------------------
+    # Lookup / store
+    # -------------------------
+    def get(self, key):
+        """Return a copy of the cached result, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_expired(entry[0], now):
+                    del self._memory[key]
+                    self.expired += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[2])
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, question, result FROM eval_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if self._is_expired(row[0], now):
+                        self._db.execute("DELETE FROM eval_cache WHERE key = ?", (key,))
+                        self._db.commit()
+                        self.expired += 1
+                    else:
+                        self._remember(key, row)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(row[2])
+
+            self.misses += 1
+            return None
+
+    def put(self, key, question, result):
+        self.put_many([(key, question, result)])
+
+    def put_many(self, items):
+        """Store [(key, question, result)]; disk writes share one transaction"""
+        now = time.time()
+        rows = [(key, question, now, json.dumps(result)) for key, question, result in items]
+        with self._lock:
+            for key, question, stored_at, text in rows:
+                self._remember(key, (stored_at, question, text))
+            if self._db is not None and rows:
+                self._db.executemany("INSERT OR REPLACE INTO eval_cache VALUES (?, ?, ?, ?)", rows)
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self._memory[key] = tuple(entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_evaluate(self, answer, q_type="definition", question=None,
+                        evaluate=evaluate_answer, scorer="keyword"):
+        """
+        Return the cached result or compute it with evaluate(answer, q_type,
+        question). Fallback results (fallback_reason set) are not cached.
+        """
+        key = self.make_key(answer, q_type, question, scorer)
+        result = self.get(key)
+        if result is None:
+            result = evaluate(answer, q_type, question)
+            if "fallback_reason" not in result:
+                self.put(key, question, result)
+        return result
+
+    # -------------------------
+    # Invalidation
+    # -------------------------
+    def invalidate_question(self, question):
+        """Drop every entry for a question (called when its rubric changes)"""
+        with self._lock:
+            stale = [key for key, entry in self._memory.items() if entry[1] == question]
+            for key in stale:
+                del self._memory[key]
+            removed = len(stale)
+            if self._db is not None:
+                removed += self._db.execute(
+                    "DELETE FROM eval_cache WHERE question = ?", (question,)
+                ).rowcount
+                self._db.commit()
+            self.invalidations += removed
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM eval_cache")
+                self._db.commit()
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def close(self):
+        """Close the disk tier and stop listening for rubric changes"""
+        self.rubric_book.remove_listener(self.invalidate_question)
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_eval_cache = None
+
+
+def get_eval_cache():
+    """Return the process-wide cache (SQLite tier enabled by EVAL_CACHE_DB)"""
+    global _eval_cache
+    if _eval_cache is None:
+        _eval_cache = EvalCache(db_path=os.environ.get(CACHE_DB_ENV))
+    return _eval_cache
@@ -0,0 +1,78 @@
+# frame_buffer.py
+import threading
+
+import numpy as np
+
+
+class FrameBuffer:
+    """
+    Triple buffer between the capture thread and its readers.
+    The writer fills a preallocated slot in place and publishes it with a
+    new sequence number; readers get a read-only view of the newest slot
+    without copying. A reader that works on a frame for a while leases it
+    (read(lease=True) ... release(frame)): the writer never writes into a
+    leased slot, it swaps in a fresh array instead, so leased frames are
+    never torn. Unleased views are only safe for an immediate copy.
+    """
+
+    def __init__(self, slots=3):
+        self._slots = [None] * slots
+        self._leases = [0] * slots   # Readers holding each slot
+        self._index = -1             # Slot holding the newest frame
+        self.seq = 0                 # Sequence number of the newest frame
+        self.swapped = 0             # Slots replaced because a reader held them
+        self._lock = threading.Lock()
+
+    def write_slot(self, shape, dtype=np.uint8):
+        """Return the slot the writer should fill next (never the published or a leased one)"""
+        with self._lock:
+            index = (self._index + 1) % len(self._slots)
+            slot = self._slots[index]
+            if self._leases[index]:
+                # A reader still holds this array; it keeps it, we take a new one
+                slot = None
+                self._leases[index] = 0
+                self.swapped += 1
+            if slot is None or slot.shape != shape or slot.dtype != dtype:
+                slot = np.empty(shape, dtype=dtype)
+                self._slots[index] = slot
+            return slot
+
+    def publish(self):
+        """Make the slot returned by write_slot the newest frame"""
+        with self._lock:
+            self._index = (self._index + 1) % len(self._slots)
+            self.seq += 1
+            return self.seq
+
+    def clear(self):
+        """Drop the current frame (the sequence number keeps counting)"""
+        with self._lock:
+            self._index = -1
+
+    def read(self, since_seq=None, lease=False):
+        """
+        Return (seq, frame) for the newest frame as a read-only view.
+        frame is None if there is no frame yet or seq == since_seq.
+        With lease=True the frame must be handed back with release().
+        """
+        with self._lock:
+            seq = self.seq
+            if self._index < 0 or (since_seq is not None and since_seq == seq):
+                return seq, None
+            if lease:
+                self._leases[self._index] += 1
+            view = self._slots[self._index].view()
+        view.flags.writeable = False
+        return seq, view
+
+    def release(self, frame):
+        """End a lease taken with read(lease=True)"""
+        if frame is None:
+            return
+        with self._lock:
+            for index, slot in enumerate(self._slots):
+                if slot is frame.base:
+                    self._leases[index] = max(0, self._leases[index] - 1)
+                    return
+            # Slot was swapped out while leased; the array is simply dropped
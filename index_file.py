@@ -0,0 +1,49 @@
+# index_file.py
+
+"""
+Compiled index files for JSON data sources (question bank, skill
+taxonomy). An index is a marshal dump tagged with its layout version and
+the SHA-256 of the source it was built from, so a stale one is ignored.
+"""
+
+import hashlib
+import marshal
+import os
+
+
+def source_signature(path):
+    """Cheap change check for a source file: (mtime, size)"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_source(path):
+    """Return (raw bytes, sha256 hex) of a source file"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def read_index(index_path, version, source_sha256):
+    """Return the index if it exists and was built from this exact source"""
+    try:
+        with open(index_path, "rb") as f:
+            # One read + loads is much faster than marshal.load on a file
+            index = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != version \
+            or index.get("source_sha256") != source_sha256:
+        return None
+    return index
+
+
+def write_index(index_path, index, tag="Index"):
+    """Write the index atomically (per-process temp file + rename)"""
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"  # Pool workers may write at once
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"[{tag}] Could not write index:", e)
@@ -1,30 +1,132 @@
+import os
 import random
-from questions import questions
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
-# Mock evaluation for offline AI logic
-def evaluate_answer(answer, q_type="definition"):
-    answer = answer.strip().lower()
-    
+from question_bank import get_question_bank
+from rubric import get_rubric_book
+
+# Bank questions may carry their own "keywords"; their rubrics are compiled
+# on the first lookup, so importing this module reads no files
+get_rubric_book().add_loader(lambda book: book.register_questions(get_question_bank().questions()))
+
+# Offline AI logic: compiled keyword rubrics (see rubric.py)
+def evaluate_answer(answer, q_type="definition", question=None):
+    """
+    Score an answer against the rubric for its question (or its type).
+    Returns score, feedback, a per-keyword breakdown and missing keywords.
+    """
+    answer = answer.strip()
+
+    rubric = get_rubric_book().get(question, q_type)
     if not answer:
-        return {"score": 0, "feedback": "You did not answer the question."}
-
-    # Simple scoring logic
-    if q_type == "definition":
-        # Check for key words (mock logic)
-        keywords = ["object-oriented", "class", "method", "data", "learning", "program"]
-        score = min(10, sum([1 for word in keywords if word in answer]))
-        feedback = "Good attempt." if score > 5 else "Needs more detail."
-    elif q_type == "programming":
-        # Check if user typed "def" or basic code keywords
-        keywords = ["def", "for", "while", "return", "print"]
-        score = min(10, sum([1 for word in keywords if word in answer]))
-        feedback = "Code structure looks good." if score > 5 else "Check your code logic."
-
-    return {"score": score, "feedback": feedback}
+        return {
+            "score": 0,
+            "feedback": "You did not answer the question.",
+            "breakdown": [],
+            "missing": [keyword for keyword, _ in rubric.keywords],
+            "rubric_version": rubric.version
+        }
+
+    return rubric.score(answer)
+
+# -------------------------
+# Batch evaluation
+# -------------------------
+def _evaluate_chunk(records):
+    """Worker task: score a list of (question, q_type, answer) records"""
+    return [evaluate_answer(answer or "", q_type or "definition", question)
+            for question, q_type, answer in records]
+
+
+def _chunks(records, chunk_size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_batch(records, workers=None, chunk_size=500, cache=None):
+    """
+    Score an iterable of (question, q_type, answer) records.
+    Results are yielded in input order as chunks finish, so huge archives
+    stream through with bounded memory. workers=1 scores in-process;
+    otherwise chunks run across a process pool. Worker processes only know
+    the rubrics compiled at import time; use workers=1 for rubrics
+    registered at runtime. With an EvalCache, cached records are not
+    re-scored and new results are stored back.
+    """
+    workers = workers or os.cpu_count()
+    chunks = _chunks(records, chunk_size)
+    if cache is not None:
+        chunks = (_cached_chunk(chunk, cache) for chunk in chunks)
+
+    def results(chunk, scored):
+        if cache is None:
+            return scored
+        return _merge_cached(chunk, scored, cache)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from results(chunk, _evaluate_chunk(_pending(chunk, cache)))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append((chunk, executor.submit(_evaluate_chunk, _pending(chunk, cache))))
+            # Keep a bounded window of chunks queued, oldest first
+            if len(in_flight) >= workers * 2:
+                chunk, future = in_flight.popleft()
+                yield from results(chunk, future.result())
+        while in_flight:
+            chunk, future = in_flight.popleft()
+            yield from results(chunk, future.result())
+
+
+def _cached_chunk(chunk, cache):
+    """[(record, key, cached result or None)]"""
+    annotated = []
+    for question, q_type, answer in chunk:
+        key = cache.make_key(answer or "", q_type or "definition", question)
+        annotated.append(((question, q_type, answer), key, cache.get(key)))
+    return annotated
+
+
+def _pending(chunk, cache):
+    """Records of a chunk that still need scoring (duplicates scored once)"""
+    if cache is None:
+        return chunk
+    seen = set()
+    pending = []
+    for record, key, cached in chunk:
+        if cached is None and key not in seen:
+            seen.add(key)
+            pending.append(record)
+    return pending
+
+
+def _merge_cached(chunk, scored, cache):
+    """Interleave fresh results with cached ones and store the fresh ones"""
+    scored = iter(scored)
+    fresh = {}
+    merged = []
+    for (question, _, _), key, cached in chunk:
+        if cached is None:
+            if key not in fresh:
+                fresh[key] = (question, next(scored))
+            cached = fresh[key][1]
+        merged.append(cached)
+    cache.put_many([(key, question, result) for key, (question, result) in fresh.items()])
+    return merged
+
 
 # Pick a random question
 def ask_question(role):
-    role_questions = questions.get(role, [])
+    role_questions = get_question_bank().questions(role=role)
     if not role_questions:
         return {"question": "No questions available", "type": "definition"}
     
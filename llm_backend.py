@@ -0,0 +1,420 @@
+# llm_backend.py
+
+import asyncio
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+from eval_cache import get_eval_cache
+from interview_engine import evaluate_answer
+from prompts import INTERVIEW_COACH_PROMPT
+
+DEFAULT_TIMEOUT = 30.0        # Seconds per request attempt
+DEFAULT_CONCURRENCY = 4       # Requests in flight at once
+DEFAULT_RETRIES = 3           # Extra attempts after the first
+BACKOFF_BASE = 0.5            # Seconds; doubles each retry (plus jitter)
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+_SCORE = re.compile(r"score\s*[:=]?\s*(\d+(?:\.\d+)?)\s*(?:/\s*10)?", re.IGNORECASE)
+
+
+class LLMError(Exception):
+    """Request to the chat endpoint failed"""
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+# -------------------------
+# Pooled HTTP/1.1 client (asyncio streams)
+# -------------------------
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def usable(self):
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host, reused across requests"""
+
+    def __init__(self, host, port, use_ssl=False, max_idle=DEFAULT_CONCURRENCY):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl.create_default_context() if use_ssl else None
+        self.max_idle = max_idle
+        self.opened = 0               # Connections created (for pooling stats)
+        self._idle = []
+
+    async def acquire(self):
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.usable():
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context
+        )
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, conn, reuse=True):
+        if reuse and conn.usable() and len(self._idle) < self.max_idle:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+async def _read_head(reader):
+    """Read the status line and headers of an HTTP response"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before response")
+    status = int(status_line.split(b" ", 2)[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _iter_body(reader, headers):
+    """Yield raw body bytes (chunked, sized, or until EOF)"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Trailers
+                return
+            data = await reader.readexactly(size)
+            await reader.readexactly(2)
+            yield data
+    elif "content-length" in headers:
+        length = int(headers["content-length"])
+        if length:
+            yield await reader.readexactly(length)
+    else:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            yield data
+
+
+# -------------------------
+# LLM evaluation backend
+# -------------------------
+class LLMEvaluator:
+    """
+    Sends answers to an OpenAI-compatible /chat/completions endpoint.
+    Connections are pooled, concurrency is bounded by a semaphore, each
+    attempt has a timeout, and failed requests are retried with
+    exponential backoff (never after tokens have been streamed). If all
+    attempts fail the keyword rubric result is returned instead.
+    """
+
+    def __init__(self, base_url, api_key=None, model="gpt-4o-mini",
+                 timeout=DEFAULT_TIMEOUT, max_concurrency=DEFAULT_CONCURRENCY,
+                 max_retries=DEFAULT_RETRIES, backoff_base=BACKOFF_BASE, cache=None):
+        url = urlsplit(base_url.rstrip("/"))
+        use_ssl = url.scheme == "https"
+        self.host = url.hostname
+        self.port = url.port or (443 if use_ssl else 80)
+        self.path = f"{url.path}/chat/completions"
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.pool = ConnectionPool(self.host, self.port, use_ssl, max_idle=max_concurrency)
+        self.cache = cache            # Optional EvalCache for repeated answers
+        self._semaphore = None
+
+        # Stats
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    # -------------------------
+    # Request plumbing
+    # -------------------------
+    def _build_request(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        lines = [
+            f"POST {self.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            "Accept: text/event-stream",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive"
+        ]
+        if self.api_key:
+            lines.append(f"Authorization: Bearer {self.api_key}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _attempt(self, payload, on_token):
+        """One request; streams content tokens to on_token and returns the full text"""
+        conn = await self.pool.acquire()
+        reusable = False
+        try:
+            conn.writer.write(self._build_request(payload))
+            await conn.writer.drain()
+
+            status, headers = await _read_head(conn.reader)
+            if status != 200:
+                body = b"".join([chunk async for chunk in _iter_body(conn.reader, headers)])
+                reusable = "content-length" in headers or "transfer-encoding" in headers
+                raise LLMError(
+                    f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}",
+                    retryable=status in RETRY_STATUSES
+                )
+
+            parts = []
+            buffer = b""
+            async for chunk in _iter_body(conn.reader, headers):
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    token = _parse_sse_line(line)
+                    if token:
+                        parts.append(token)
+                        if on_token:
+                            on_token(token)
+            # Non-streaming JSON reply (or a final line without newline)
+            if buffer.strip():
+                token = _parse_sse_line(buffer) or _parse_json_body(buffer)
+                if token:
+                    parts.append(token)
+                    if on_token:
+                        on_token(token)
+
+            reusable = (
+                headers.get("connection", "").lower() != "close"
+                and ("content-length" in headers or "transfer-encoding" in headers)
+            )
+            return "".join(parts)
+        finally:
+            self.pool.release(conn, reuse=reusable)
+
+    async def complete(self, messages, on_token=None, max_tokens=300):
+        """Chat completion with bounded concurrency, timeouts and retries"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+            "max_tokens": max_tokens,
+            "temperature": 0.2
+        }
+        streamed = []
+
+        def track(token):
+            streamed.append(token)
+            if on_token:
+                on_token(token)
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                self.requests += 1
+                try:
+                    return await asyncio.wait_for(self._attempt(payload, track), self.timeout)
+                except (LLMError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    retryable = not isinstance(e, LLMError) or e.retryable
+                    # Retrying after partial output would duplicate streamed text
+                    if streamed or not retryable or attempt == self.max_retries:
+                        self.failures += 1
+                        raise LLMError(f"{type(e).__name__}: {e}") from e
+                    self.retries += 1
+                    delay = self.backoff_base * (2 ** attempt)
+                    await asyncio.sleep(delay + random.uniform(0, self.backoff_base))
+
+    # -------------------------
+    # Answer evaluation
+    # -------------------------
+    async def evaluate(self, question, answer, q_type="definition", on_token=None):
+        """
+        Ask the coach model to evaluate an answer.
+        Returns the same shape as evaluate_answer plus scorer/latency_ms.
+        """
+        if not answer.strip():
+            return evaluate_answer(answer, q_type, question)
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(answer, q_type, question, scorer=f"llm:{self.model}")
+            cached = self.cache.get(key)
+            if cached is not None:
+                if on_token:
+                    on_token(cached["feedback"])
+                return cached
+
+        messages = [
+            {"role": "system", "content": INTERVIEW_COACH_PROMPT.strip()},
+            {"role": "user", "content": (
+                f"Question ({q_type}): {question}\n"
+                f"Candidate answer: {answer.strip()}\n\n"
+                "Evaluate the answer and end with a line 'Score: N/10'."
+            )}
+        ]
+
+        start = time.perf_counter()
+        try:
+            text = await self.complete(messages, on_token)
+        except LLMError as e:
+            result = evaluate_answer(answer, q_type, question)
+            result["scorer"] = "keyword"
+            result["fallback_reason"] = str(e)
+            return result
+
+        match = None
+        for match in _SCORE.finditer(text):
+            pass  # Last "Score: N" wins
+        if match is not None:
+            score = min(10, max(0, round(float(match.group(1)))))
+        else:
+            score = evaluate_answer(answer, q_type, question)["score"]
+
+        result = {
+            "score": score,
+            "feedback": text.strip(),
+            "scorer": "llm",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        if key is not None:
+            self.cache.put(key, question, result)
+        return result
+
+    async def warm_up(self):
+        """Open a pooled connection ahead of the next evaluation"""
+        try:
+            conn = await asyncio.wait_for(self.pool.acquire(), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            print("[LLM] Warm-up failed:", e)
+            return
+        self.pool.release(conn)
+
+    def close(self):
+        self.pool.close()
+
+
+def _parse_sse_line(line):
+    """Content token from one 'data: {...}' server-sent-event line"""
+    line = line.strip()
+    if not line.startswith(b"data:"):
+        return None
+    data = line[5:].strip()
+    if data == b"[DONE]":
+        return None
+    try:
+        choice = json.loads(data)["choices"][0]
+    except (ValueError, KeyError, IndexError):
+        return None
+    return (choice.get("delta") or {}).get("content") or None
+
+
+def _parse_json_body(body):
+    try:
+        return json.loads(body)["choices"][0]["message"]["content"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+# -------------------------
+# Background event loop for the Tk app
+# -------------------------
+class BackgroundLoop:
+    """Runs an asyncio loop on a daemon thread; submit() returns a concurrent Future"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_llm_evaluator = None
+
+
+def get_llm_evaluator():
+    """
+    Return the process-wide evaluator configured from LLM_BASE_URL,
+    LLM_API_KEY and LLM_MODEL, or None if LLM_BASE_URL is not set.
+    """
+    global _llm_evaluator
+    base_url = os.environ.get("LLM_BASE_URL")
+    if not base_url:
+        return None
+    if _llm_evaluator is None:
+        _llm_evaluator = LLMEvaluator(
+            base_url,
+            api_key=os.environ.get("LLM_API_KEY"),
+            model=os.environ.get("LLM_MODEL", "gpt-4o-mini"),
+            cache=get_eval_cache()
+        )
+    return _llm_evaluator
+
+
+# -------------------------
+# Benchmark against the local stub server
+# -------------------------
+async def benchmark(requests=200, concurrency=DEFAULT_CONCURRENCY, token_delay=0.002):
+    """Fire evaluations at llm_stub_server and report latency and throughput"""
+    from llm_stub_server import StubLLMServer
+
+    server = StubLLMServer(token_delay=token_delay)
+    await server.start()
+    evaluator = LLMEvaluator(server.base_url, max_concurrency=concurrency)
+
+    async def one(i):
+        start = time.perf_counter()
+        await evaluator.evaluate("What is an API?", f"An interface between programs {i}")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(one(i) for i in range(requests))))
+    elapsed = time.perf_counter() - start
+
+    evaluator.close()
+    await server.stop()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "req_per_sec": requests / elapsed,
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p95_ms": 1000 * latencies[int(len(latencies) * 0.95) - 1],
+        "connections_opened": evaluator.pool.opened,
+        "server_connections": server.connections
+    }
+
+
+if __name__ == "__main__":
+    for key, value in asyncio.run(benchmark()).items():
+        print(f"{key:>20}: {value:.1f}" if isinstance(value, float) else f"{key:>20}: {value}")
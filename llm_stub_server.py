@@ -0,0 +1,165 @@
+# llm_stub_server.py
+
+"""
+Local stand-in for an OpenAI-compatible chat endpoint.
+
+Serves POST /v1/chat/completions with canned coaching feedback, either
+streamed as server-sent events or as one JSON body, so the LLM backend
+can be tested and benchmarked offline. Can inject failures (fail_first)
+and per-token latency (token_delay).
+
+Usage:
+    python llm_stub_server.py --port 8765
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 python app_ui.py
+"""
+
+import argparse
+import asyncio
+import json
+
+
+def _coach_reply(answer):
+    """Deterministic feedback: longer answers score higher"""
+    words = len(answer.split())
+    score = min(10, 2 + words // 4)
+    if score > 5:
+        verdict = "Your answer covers the main idea clearly."
+    else:
+        verdict = "Your answer is a good start but misses key details."
+    return f"{verdict} Try to add a concrete example from your own experience.\nScore: {score}/10"
+
+
+class StubLLMServer:
+    """Minimal asyncio HTTP/1.1 server with keep-alive and chunked streaming"""
+
+    def __init__(self, host="127.0.0.1", port=0, token_delay=0.0, fail_first=0,
+                 fail_status=503):
+        self.host = host
+        self.port = port
+        self.token_delay = token_delay
+        self.fail_first = fail_first      # Fail this many requests before succeeding
+        self.fail_status = fail_status
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+        self._handlers = set()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        # Idle keep-alive handlers would otherwise wait for the next request forever
+        for task in self._handlers:
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"[Stub LLM] Listening on {self.base_url}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    # -------------------------
+    # Connection handling
+    # -------------------------
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests += 1
+                method, path = request_line.decode("latin-1").split(" ")[:2]
+                if method != "POST" or not path.endswith("/chat/completions"):
+                    await self._send_json(writer, 404, {"error": "not found"})
+                elif self.fail_first > 0:
+                    self.fail_first -= 1
+                    await self._send_json(writer, self.fail_status, {"error": "injected failure"})
+                else:
+                    await self._complete(writer, json.loads(body))
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Server shutting down; end the handler quietly
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _send_json(self, writer, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} Stub\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    async def _complete(self, writer, request):
+        user_messages = [m["content"] for m in request.get("messages", []) if m.get("role") == "user"]
+        prompt = user_messages[-1] if user_messages else ""
+        answer = prompt.split("Candidate answer:", 1)[-1].split("\n\n", 1)[0]
+        reply = _coach_reply(answer)
+
+        if not request.get("stream"):
+            await self._send_json(writer, 200, {
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}}]
+            })
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        tokens = reply.split(" ")
+        for i, token in enumerate(tokens):
+            delta = {"content": token if i == 0 else f" {token}"}
+            event = f"data: {json.dumps({'choices': [{'index': 0, 'delta': delta}]})}\n\n"
+            self._write_chunk(writer, event.encode("utf-8"))
+            await writer.drain()
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+
+
+# -------------------------
+# Entry Point
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible chat server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between tokens")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail the first N requests")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.token_delay, args.fail_first)
+    asyncio.run(server.serve_forever())
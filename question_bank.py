@@ -0,0 +1,244 @@
+# question_bank.py
+
+import json
+import os
+import threading
+import time
+
+from index_file import read_index, read_source, source_signature, write_index
+
+# Resolved from this file so imports work from any working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+ROLES_FILE = os.path.join(DATA_DIR, "roles.json")
+INDEX_FILE = os.path.join(DATA_DIR, "questions.index")
+INDEX_VERSION = 2            # Bump when the index layout changes
+DEFAULT_TYPE = "definition"
+TYPE_DIFFICULTY = {"programming": 0.5}  # Default difficulty (logits) when none is given
+
+
+def question_difficulty(q):
+    """Difficulty of a question dict: its own value or the default for its type"""
+    difficulty = q.get("difficulty")
+    if difficulty is None:
+        difficulty = TYPE_DIFFICULTY.get(q.get("type", DEFAULT_TYPE), 0.0)
+    return float(difficulty)
+
+
+# -------------------------
+# Compiled snapshot
+# -------------------------
+def compile_bank(data):
+    """
+    Flatten roles.json data into columns (one entry per question ID) plus
+    lookup indexes by role, level, type and tag. Question entries may be
+    plain strings (type "definition") or dicts with question/type/tags/
+    level/difficulty/keywords.
+    """
+    columns = {"question": [], "type": [], "role": [], "level": [], "tags": [],
+               "difficulty": [], "keywords": []}
+    indexes = {"role": {}, "level": {}, "type": {}, "tag": {}}
+    roles = {}
+
+    for role, spec in data["roles"].items():
+        role_level = spec.get("level", "Entry")
+        roles[role] = {"level": role_level}
+        for entry in spec.get("questions", []):
+            if isinstance(entry, str):
+                entry = {"question": entry}
+            qid = len(columns["question"])
+            q_type = entry.get("type", DEFAULT_TYPE)
+            level = entry.get("level", role_level)
+            tags = list(entry.get("tags", []))
+
+            columns["question"].append(entry["question"])
+            columns["type"].append(q_type)
+            columns["role"].append(role)
+            columns["level"].append(level)
+            columns["tags"].append(tags)
+            columns["difficulty"].append(question_difficulty(entry))
+            columns["keywords"].append(entry.get("keywords"))
+
+            indexes["role"].setdefault(role, []).append(qid)
+            indexes["level"].setdefault(level, []).append(qid)
+            indexes["type"].setdefault(q_type, []).append(qid)
+            for tag in tags:
+                indexes["tag"].setdefault(tag, []).append(qid)
+
+    return {"roles": roles, "columns": columns, "indexes": indexes}
+
+
+class QuestionBank:
+    """
+    One immutable version of the question bank.
+    Questions are stored column-wise and addressed by integer ID; the
+    role/level/type/tag indexes are ID lists, so filtering never scans
+    the whole bank. Question dicts are only built for the IDs asked for.
+    """
+
+    def __init__(self, compiled, source_sha256=None):
+        self.roles = compiled["roles"]
+        self._columns = compiled["columns"]
+        self._indexes = compiled["indexes"]
+        self.source_sha256 = source_sha256
+        self._by_text = None             # Built on first find()
+
+    def __len__(self):
+        return len(self._columns["question"])
+
+    def question(self, qid):
+        """Question dict for an ID"""
+        columns = self._columns
+        q = {
+            "id": qid,
+            "question": columns["question"][qid],
+            "type": columns["type"][qid],
+            "role": columns["role"][qid],
+            "level": columns["level"][qid],
+            "tags": columns["tags"][qid],
+            "difficulty": columns["difficulty"][qid]
+        }
+        if columns["keywords"][qid]:
+            q["keywords"] = columns["keywords"][qid]
+        return q
+
+    def ids(self, role=None, level=None, q_type=None, tag=None):
+        """IDs matching every given filter, in bank order"""
+        selected = None
+        for name, value in (("role", role), ("level", level), ("type", q_type), ("tag", tag)):
+            if value is None:
+                continue
+            ids = self._indexes[name].get(value, ())
+            if selected is None:
+                selected = set(ids)
+            else:
+                selected.intersection_update(ids)
+            if not selected:
+                return []
+        if selected is None:
+            return list(range(len(self)))
+        return sorted(selected)
+
+    def questions(self, role=None, level=None, q_type=None, tag=None):
+        """Question dicts matching every given filter"""
+        return [self.question(qid) for qid in self.ids(role, level, q_type, tag)]
+
+    def find(self, text):
+        """ID of a question by its exact text, or None"""
+        if self._by_text is None:
+            self._by_text = {q: i for i, q in enumerate(self._columns["question"])}
+        return self._by_text.get(text)
+
+    def values(self, name):
+        """Distinct values of an index (role, level, type or tag)"""
+        return list(self._indexes[name])
+
+    def by_role(self):
+        """{role: [question dicts]} for every role"""
+        return {role: self.questions(role=role) for role in self.roles}
+
+
+# -------------------------
+# Loader (index file cache)
+# -------------------------
+class QuestionBankStore:
+    """
+    Loads data/roles.json through a compiled marshal index next to it,
+    so startup skips JSON parsing and index building while the source is
+    unchanged. The snapshot is shared by every InterviewAgent in the
+    process and rebuilt when the source file changes.
+    """
+
+    def __init__(self, source_path=ROLES_FILE, index_path=INDEX_FILE):
+        self.source_path = source_path
+        self.index_path = index_path
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._signature = None       # (mtime, size) of the loaded source
+        self._bank = None
+
+    def current(self):
+        """Return the current bank, loading it on first use or after the source changed"""
+        if self._bank is None or source_signature(self.source_path) != self._signature:
+            with self._lock:
+                if self._bank is None or source_signature(self.source_path) != self._signature:
+                    self._load()
+        return self._bank
+
+    def _load(self):
+        signature = source_signature(self.source_path)
+        raw, source_sha256 = read_source(self.source_path)
+
+        index = read_index(self.index_path, INDEX_VERSION, source_sha256)
+        if index is None:
+            index = {
+                "version": INDEX_VERSION,
+                "source_sha256": source_sha256,
+                "bank": compile_bank(json.loads(raw.decode("utf-8")))
+            }
+            write_index(self.index_path, index, "Questions")
+
+        self._bank = QuestionBank(index["bank"], source_sha256)
+        self._signature = signature
+        self.loads += 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_question_bank():
+    """Return the current snapshot of the process-wide question bank"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = QuestionBankStore()
+    return _store.current()
+
+
+# -------------------------
+# Load-time check on a large synthetic bank
+# -------------------------
+def benchmark(question_count=50000, roles=20):
+    """Compile a synthetic bank, then time loading it from the index file"""
+    import tempfile
+
+    data = {"roles": {
+        f"Role {r}": {"level": "Entry", "questions": [
+            {"question": f"Question {r}-{i}?", "type": "definition" if i % 2 else "programming",
+             "tags": [f"tag{i % 50}"]}
+            for i in range(question_count // roles)
+        ]} for r in range(roles)
+    }}
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "roles.json")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        index_path = os.path.join(tmp, "questions.index")
+
+        start = time.perf_counter()
+        QuestionBankStore(source_path, index_path).current()
+        compile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bank = QuestionBankStore(source_path, index_path).current()
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ids = bank.ids(role="Role 3", q_type="programming", tag="tag4")
+        query_seconds = time.perf_counter() - start
+
+    return {
+        "questions": len(bank),
+        "compile_ms": 1000 * compile_seconds,
+        "index_load_ms": 1000 * load_seconds,
+        "query_ms": 1000 * query_seconds,
+        "query_hits": len(ids)
+    }
+
+
+if __name__ == "__main__":
+    bank = get_question_bank()
+    print(f"{len(bank)} questions, roles: {', '.join(bank.roles)}")
+    for key, value in benchmark().items():
+        print(f"{key:>14}: {value:.2f}" if isinstance(value, float) else f"{key:>14}: {value}")
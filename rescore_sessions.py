@@ -0,0 +1,181 @@
+# rescore_sessions.py
+
+"""
+Re-score saved interview sessions with the current rubrics.
+
+Reads every session_*.json written by SessionManager.save_session,
+re-evaluates all answers with interview_engine.evaluate_batch and prints
+aggregate statistics. Session files are not modified; use --output to
+write one JSON line per session with the new scores.
+
+Usage:
+    python rescore_sessions.py sessions/ --workers 4 --output rescored.jsonl
+    python rescore_sessions.py sessions/ --cache data/eval_cache.db
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from collections import defaultdict
+
+from eval_cache import EvalCache
+from interview_engine import evaluate_batch
+
+
+# -------------------------
+# Loading
+# -------------------------
+def iter_sessions(folder):
+    """Yield (path, session dict) for every readable session file"""
+    for path in sorted(glob.glob(os.path.join(folder, "session_*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield path, json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Rescore] Skipping {path}: {e}")
+
+
+def iter_answers(folder, sessions_out):
+    """
+    Yield (question, q_type, answer) for every stored answer, recording
+    each session's path/role/old scores in sessions_out as it goes.
+    """
+    for path, session in iter_sessions(folder):
+        entries = session.get("questions", [])
+        sessions_out.append({
+            "path": path,
+            "role": session.get("role", "Unknown"),
+            "old_scores": [q.get("score", 0) for q in entries]
+        })
+        for q in entries:
+            # Older files have no "type"; the agent's default is "definition"
+            yield q.get("question"), q.get("type", "definition"), q.get("answer", "")
+
+
+# -------------------------
+# Re-scoring
+# -------------------------
+def rescore(folder, workers=None, output_path=None, cache=None):
+    """
+    Re-score every session under folder and return aggregate statistics.
+    With an EvalCache, answers already scored under the current rubric
+    (in this run or an earlier one) are not scored again.
+    """
+    sessions = []
+    results = evaluate_batch(iter_answers(folder, sessions), workers=workers, cache=cache)
+
+    stats = {
+        "sessions": 0,
+        "answers": 0,
+        "changed": 0,
+        "old_total": 0,
+        "new_total": 0,
+        "histogram": [0] * 11,               # New scores 0..10
+        "by_role": defaultdict(lambda: {"answers": 0, "old_total": 0, "new_total": 0})
+    }
+    start = time.perf_counter()
+    out = open(output_path, "w", encoding="utf-8") if output_path else None
+
+    try:
+        # Results stream back in input order, so walk sessions in lockstep
+        index = 0
+        for result in results:
+            while not sessions[index]["old_scores"]:
+                _finish_session(sessions[index], stats, out)  # Session without answers
+                index += 1
+            session = sessions[index]
+            session.setdefault("new_scores", []).append(result["score"])
+            if len(session["new_scores"]) == len(session["old_scores"]):
+                _finish_session(session, stats, out)
+                index += 1
+        # Trailing sessions without answers
+        for session in sessions[index:]:
+            _finish_session(session, stats, out)
+    finally:
+        if out:
+            out.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["by_role"] = dict(stats["by_role"])
+    if cache is not None:
+        stats["cache"] = cache.get_stats()
+    return stats
+
+
+def _finish_session(session, stats, out):
+    old_scores = session["old_scores"]
+    new_scores = session.get("new_scores", [])
+    role = stats["by_role"][session["role"]]
+
+    stats["sessions"] += 1
+    stats["answers"] += len(new_scores)
+    role["answers"] += len(new_scores)
+    for old, new in zip(old_scores, new_scores):
+        stats["old_total"] += old
+        stats["new_total"] += new
+        role["old_total"] += old
+        role["new_total"] += new
+        stats["histogram"][min(10, max(0, int(new)))] += 1
+        if old != new:
+            stats["changed"] += 1
+
+    if out:
+        out.write(json.dumps({
+            "path": session["path"],
+            "role": session["role"],
+            "old_total": sum(old_scores),
+            "new_total": sum(new_scores),
+            "new_scores": new_scores
+        }) + "\n")
+
+
+def print_report(stats):
+    """Print aggregate statistics"""
+    answers = stats["answers"] or 1
+    rate = stats["answers"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"Sessions: {stats['sessions']}  Answers: {stats['answers']}  ({rate:.0f} answers/sec)")
+    print(f"Mean score: {stats['old_total'] / answers:.2f} -> {stats['new_total'] / answers:.2f}  "
+          f"(changed: {stats['changed']})")
+
+    print("Score distribution:")
+    for score, count in enumerate(stats["histogram"]):
+        print(f"  {score:>2}: {count}")
+
+    print("By role (old -> new mean):")
+    for role, data in sorted(stats["by_role"].items()):
+        n = data["answers"] or 1
+        print(f"  {role:<20} {data['old_total'] / n:5.2f} -> {data['new_total'] / n:5.2f}  "
+              f"({data['answers']} answers)")
+
+    if "cache" in stats:
+        cache = stats["cache"]
+        print(f"Cache: {cache['hits']} hits ({cache['disk_hits']} from disk), "
+              f"{cache['misses']} misses, hit rate {cache['hit_rate']:.0%}")
+
+
+# -------------------------
+# Entry Point
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score saved interview sessions")
+    parser.add_argument("folder", nargs="?", default="sessions", help="Session JSON folder")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("-o", "--output", default=None, help="Write per-session JSONL here")
+    parser.add_argument("--cache", default=None,
+                        help="SQLite evaluation cache reused across runs (e.g. data/eval_cache.db)")
+    parser.add_argument("--no-cache", action="store_true", help="Score every answer")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else EvalCache(db_path=args.cache)
+    try:
+        print_report(rescore(args.folder, workers=args.workers, output_path=args.output,
+                             cache=cache))
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,69 @@
-def extract_skills(resume_text):
-    skills_db = [
-        "python", "java", "sql", "machine learning",
-        "deep learning", "react", "node", "tensorflow",
-        "mysql", "mongodb", "data analysis"
-    ]
+import random
+import time
+
+from skill_taxonomy import SkillMatcher, get_taxonomy
+
+
+def get_skill_matcher():
+    """Return the matcher for the current taxonomy (reloaded when data/skills.json changes)"""
+    return get_taxonomy().matcher
+
 
+def extract_skills(resume_text, matcher=None):
+    return (matcher or get_skill_matcher()).extract(resume_text)
+
+
+# -------------------------
+# Benchmark against the old linear scan
+# -------------------------
+def _linear_scan(resume_text, skills_db):
+    """The previous implementation: one substring search per skill"""
     found = []
     text = resume_text.lower()
-
     for skill in skills_db:
         if skill in text:
             found.append(skill)
-
     return list(set(found))
+
+
+def benchmark(skill_count=5000, text_words=2000, repeats=20, seed=0):
+    """Time the linear scan vs. the compiled matcher on a synthetic taxonomy"""
+    rng = random.Random(seed)
+    taxonomy = {f"skill{i:05d}": [f"skill {i:05d}"] for i in range(skill_count)}
+    taxonomy.update(get_taxonomy().skills)
+    skills_db = [alias for aliases in taxonomy.values() for alias in aliases]
+
+    vocabulary = ["experience", "with", "and", "built", "team", "projects"]
+    words = [
+        rng.choice(skills_db) if rng.random() < 0.05 else rng.choice(vocabulary)
+        for _ in range(text_words)
+    ]
+    text = " ".join(words)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _linear_scan(text, skills_db)
+    scan_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        matcher.extract(text)
+    matcher_seconds = (time.perf_counter() - start) / repeats
+
+    return {
+        "patterns": matcher.pattern_count,
+        "text_chars": len(text),
+        "build_ms": 1000 * build_seconds,
+        "linear_scan_ms": 1000 * scan_seconds,
+        "matcher_ms": 1000 * matcher_seconds,
+        "speedup": scan_seconds / matcher_seconds if matcher_seconds else 0.0
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>16}: {value:.2f}" if isinstance(value, float) else f"{key:>16}: {value}")
@@ -1,13 +1,94 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
 import docx
 
-def extract_resume_text(file_path):
+PAGES_PER_TASK = 4   # Pages handled by one worker task in parallel mode
+
+
+# -------------------------
+# PDF helpers
+# -------------------------
+def count_pdf_pages(file_path):
+    """Return the number of pages in a PDF"""
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(file_path, start, stop):
+    """Worker task: extract text for pages [start, stop) of a PDF"""
+    with pdfplumber.open(file_path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _iter_pages_sequential(file_path, max_pages):
+    with pdfplumber.open(file_path) as pdf:
+        for i, page in enumerate(pdf.pages):
+            if max_pages is not None and i >= max_pages:
+                break
+            yield page.extract_text() or ""
+
+
+def _iter_pages_parallel(file_path, max_pages, workers, executor):
+    page_count = count_pdf_pages(file_path)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+    futures = [
+        executor.submit(
+            _extract_page_range, file_path, start, min(start + PAGES_PER_TASK, page_count)
+        )
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    try:
+        # Yield in page order as soon as each range is ready
+        for future in futures:
+            for text in future.result():
+                yield text
+    finally:
+        # Early stop (or error): don't run ranges nobody will read
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(file_path, max_pages=None, workers=1, executor=None):
+    """
+    Yield the text of each PDF page, in order, as it becomes available.
+    workers > 1 (or a shared executor) extracts page ranges in a process pool.
+    Stop iterating early to skip the remaining pages.
+    """
+    if workers == 1 and executor is None:
+        return _iter_pages_sequential(file_path, max_pages)
+    return _iter_pages_parallel(file_path, max_pages, workers, executor)
+
+
+# -------------------------
+# Public API
+# -------------------------
+def extract_resume_text(file_path, max_pages=None, workers=1, executor=None, stop_when=None):
+    """
+    Extract all text from a PDF/DOCX resume.
+    max_pages limits how many PDF pages are read; stop_when(page_text)
+    returning True ends extraction after that page.
+    """
     if file_path.endswith(".pdf"):
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+        pages = []
+        page_iter = iter_pdf_pages(file_path, max_pages, workers, executor)
+        try:
+            for text in page_iter:
+                pages.append(text)
+                if stop_when is not None and stop_when(text):
+                    break
+        finally:
+            page_iter.close()  # Cancels outstanding page ranges
+        return "\n".join(pages)  # Single join, linear in total length
 
     elif file_path.endswith(".docx"):
         doc = docx.Document(file_path)
@@ -1,12 +1,16 @@
-def generate_questions(skills):
+from skill_taxonomy import get_taxonomy
+
+
+def generate_questions(skills, templates=None):
+    # Templates come from data/skills.json unless given explicitly
+    if templates is None:
+        templates = get_taxonomy().question_templates
+
     questions = []
 
     for skill in skills:
-        questions.append(
-            f"Can you explain your experience working with {skill}?"
-        )
-        questions.append(
-            f"What challenges did you face while using {skill}?"
-        )
+        for template in templates:
+            # Typed so they are scored with the general (project/experience) rubric
+            questions.append({"question": template.format(skill=skill), "type": "general"})
 
     return questions
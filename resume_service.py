@@ -0,0 +1,192 @@
+# resume_service.py
+
+import hashlib
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from resume_parser import extract_resume_text
+from resume_analyzer import extract_skills
+from resume_question_gen import generate_questions
+from skill_taxonomy import get_taxonomy
+
+CACHE_DIR = "resume_cache"
+CACHE_MAX_BYTES = 50 * 1024 * 1024   # Evict oldest entries beyond 50 MB
+CACHE_VERSION = 4                    # Bump when the pipeline output changes
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -------------------------
+# On-disk cache
+# -------------------------
+class ResumeCache:
+    """
+    Stores extracted text, skills and questions per resume,
+    one JSON file per SHA-256 of the file bytes.
+    Least recently used entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key, taxonomy_sha256=None):
+        """Return the cached result for key (built with this taxonomy), or None"""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            if entry.get("version") != CACHE_VERSION or (
+                taxonomy_sha256 is not None and entry.get("taxonomy") != taxonomy_sha256
+            ):
+                self.misses += 1
+                return None
+
+            os.utime(path)  # Mark as recently used
+            self.hits += 1
+            return entry
+
+    def put(self, key, text, skills, questions, taxonomy_sha256=None):
+        """Store a result and evict old entries if the cache is too large"""
+        entry = {
+            "version": CACHE_VERSION,
+            "sha256": key,
+            "taxonomy": taxonomy_sha256,
+            "text": text,
+            "skills": skills,
+            "questions": questions
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)  # Readers never see a half-written file
+            self._evict()
+        return entry
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+# -------------------------
+# Resume processing service
+# -------------------------
+class ResumeProcessor:
+    """
+    Runs extract_resume_text -> extract_skills -> generate_questions
+    off the UI thread, reporting progress, with results cached by file hash.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or ResumeCache()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume")
+
+    def process(self, file_path, on_progress=None):
+        """
+        Process one resume synchronously.
+        on_progress(stage, fraction) is called as each stage starts.
+        Returns a dict with text, skills, questions and cached flag.
+        """
+        def progress(stage, fraction):
+            if on_progress:
+                on_progress(stage, fraction)
+
+        progress("Hashing file", 0.0)
+        key = file_sha256(file_path)
+        # Results depend on data/skills.json too; edits invalidate old entries
+        taxonomy = get_taxonomy()
+
+        entry = self.cache.get(key, taxonomy.source_sha256)
+        if entry is not None:
+            progress("Loaded from cache", 1.0)
+            return {**entry, "cached": True}
+
+        progress("Extracting text", 0.1)
+        text = extract_resume_text(file_path)
+
+        progress("Extracting skills", 0.7)
+        skills = extract_skills(text, taxonomy.matcher)
+
+        progress("Generating questions", 0.85)
+        questions = generate_questions(skills, taxonomy.question_templates)
+
+        entry = self.cache.put(key, text, skills, questions, taxonomy.source_sha256)
+        progress("Done", 1.0)
+        return {**entry, "cached": False}
+
+    def submit(self, file_path, on_progress=None, on_done=None, on_error=None):
+        """
+        Process a resume on the worker thread and return a Future.
+        Callbacks run on the worker thread; UI code should hop back with after().
+        """
+        def job():
+            try:
+                result = self.process(file_path, on_progress)
+            except Exception as e:
+                traceback.print_exc()
+                if on_error:
+                    on_error(e)
+                raise
+            if on_done:
+                on_done(result)
+            return result
+
+        return self._executor.submit(job)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,251 @@
+# rubric.py
+
+import hashlib
+import json
+import re
+import threading
+import weakref
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+# -------------------------
+# Default rubrics per question type
+# -------------------------
+# Each keyword: {"keyword", "weight", "synonyms"}; plain strings mean weight 1.
+DEFAULT_RUBRICS = {
+    "definition": {
+        "keywords": [
+            {"keyword": "object-oriented", "synonyms": ["oop"]},
+            {"keyword": "class", "synonyms": ["classes"]},
+            {"keyword": "method", "synonyms": ["methods", "function", "functions"]},
+            {"keyword": "data", "synonyms": ["dataset", "datasets"]},
+            {"keyword": "learning", "synonyms": ["learn", "learns", "learned"]},
+            {"keyword": "program", "synonyms": ["programs", "programming"]}
+        ],
+        "good_feedback": "Good attempt.",
+        "weak_feedback": "Needs more detail."
+    },
+    "programming": {
+        "keywords": ["def", "for", "while", "return", "print"],
+        "good_feedback": "Code structure looks good.",
+        "weak_feedback": "Check your code logic."
+    },
+    # Resume / project / experience questions and any other type
+    "general": {
+        "keywords": [
+            {"keyword": "project", "weight": 2, "synonyms": ["projects"]},
+            {"keyword": "built", "weight": 2, "synonyms": ["build", "developed", "implemented", "created"]},
+            {"keyword": "challenge", "weight": 2, "synonyms": ["challenges", "problem", "problems", "issue"]},
+            {"keyword": "team", "weight": 1, "synonyms": ["teams", "collaborated"]},
+            {"keyword": "result", "weight": 2, "synonyms": ["results", "outcome", "improved", "reduced"]},
+            {"keyword": "learned", "weight": 1, "synonyms": ["learnt", "lesson", "lessons"]},
+            {"keyword": "example", "weight": 1, "synonyms": ["instance", "for example"]}
+        ],
+        "good_feedback": "Good answer with concrete detail.",
+        "weak_feedback": "Add a specific example and the result you achieved."
+    }
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens (punctuation and hyphens split words)"""
+    return _TOKEN.findall(text.lower())
+
+
+# -------------------------
+# Compiled rubric
+# -------------------------
+class Rubric:
+    """
+    Weighted keyword rubric compiled into token lookup tables.
+    Every keyword and synonym is tokenized once; scoring then needs a
+    single tokenization pass over the answer. Matching is whole-word,
+    so "class" does not match inside "classification".
+    """
+
+    def __init__(self, keywords, q_type="definition", max_score=10, pass_score=5,
+                 good_feedback="Good answer.", weak_feedback="Needs more detail."):
+        self.q_type = q_type
+        self.max_score = max_score
+        self.pass_score = pass_score
+        self.good_feedback = good_feedback
+        self.weak_feedback = weak_feedback
+        self.keywords = []            # [(keyword, weight)] in rubric order
+        self._single = {}             # token -> keyword
+        self._multi = {}              # first token -> [(token tuple, keyword)]
+
+        for entry in keywords:
+            if isinstance(entry, str):
+                entry = {"keyword": entry}
+            keyword = entry["keyword"]
+            self.keywords.append((keyword, entry.get("weight", 1)))
+
+            for term in [keyword] + list(entry.get("synonyms", [])):
+                tokens = tuple(tokenize(term))
+                if len(tokens) == 1:
+                    self._single.setdefault(tokens[0], keyword)
+                elif tokens:
+                    self._multi.setdefault(tokens[0], []).append((tokens, keyword))
+
+        # Longest phrases first so the most specific one is tried first
+        for phrases in self._multi.values():
+            phrases.sort(key=lambda p: -len(p[0]))
+
+        self.version = self._fingerprint(keywords)
+
+    def _fingerprint(self, keywords):
+        """Stable hash of everything that affects scoring"""
+        spec = json.dumps(
+            [keywords, self.q_type, self.max_score, self.pass_score,
+             self.good_feedback, self.weak_feedback],
+            sort_keys=True
+        )
+        return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:12]
+
+    def match(self, answer):
+        """Return {keyword: matched term} for every keyword found in the answer"""
+        tokens = tokenize(answer)
+        found = {}
+        for i, token in enumerate(tokens):
+            for phrase, keyword in self._multi.get(token, ()):
+                if keyword not in found and tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found[keyword] = " ".join(phrase)
+            keyword = self._single.get(token)
+            if keyword is not None and keyword not in found:
+                found[keyword] = token
+        return found
+
+    def score(self, answer):
+        """Score an answer; returns score, feedback and a per-keyword breakdown"""
+        found = self.match(answer)
+
+        breakdown = []
+        total = 0
+        for keyword, weight in self.keywords:
+            matched = found.get(keyword)
+            if matched is not None:
+                total += weight
+            breakdown.append({
+                "keyword": keyword,
+                "weight": weight,
+                "matched": matched is not None,
+                "term": matched
+            })
+
+        score = min(self.max_score, total)
+        if isinstance(score, float):
+            score = round(score, 1)
+
+        return {
+            "score": score,
+            "feedback": self.good_feedback if score > self.pass_score else self.weak_feedback,
+            "breakdown": breakdown,
+            "missing": [b["keyword"] for b in breakdown if not b["matched"]],
+            "rubric_version": self.version
+        }
+
+
+# -------------------------
+# Rubric registry
+# -------------------------
+class RubricBook:
+    """
+    Compiles rubrics once and hands them out by question or type.
+    A question with its own keywords gets its own rubric; otherwise the
+    rubric for its type is used, falling back to "general".
+    """
+
+    def __init__(self, type_rubrics=None):
+        self._type_specs = dict(type_rubrics or DEFAULT_RUBRICS)
+        self._by_type = {}
+        self._by_question = {}
+        self._listeners = []          # Refs to callback(question) when a question's rubric changes
+        self._loaders = []            # Run once, on first lookup
+        self._lock = threading.Lock()
+
+    def add_loader(self, loader):
+        """
+        Defer loading question rubrics until the first lookup;
+        loader(book) is called once, so importing stays free of file I/O.
+        """
+        with self._lock:
+            self._loaders.append(loader)
+
+    def _run_loaders(self):
+        with self._lock:
+            loaders, self._loaders = self._loaders, []
+        for loader in loaders:
+            loader(self)
+
+    def add_listener(self, callback):
+        """
+        Call callback(question) whenever a registered rubric is replaced.
+        Bound methods are held weakly, so a listening object can still be
+        garbage collected; remove_listener() detaches explicitly.
+        """
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._listeners.append(ref)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners
+                               if ref() is not None and ref() != callback]
+
+    def _notify(self, question):
+        with self._lock:
+            callbacks = [ref() for ref in self._listeners]
+            self._listeners = [ref for ref, cb in zip(self._listeners, callbacks) if cb is not None]
+        for callback in callbacks:
+            if callback is not None:
+                callback(question)
+
+    def register_question(self, question, keywords, q_type="definition", **options):
+        """Compile a question-specific rubric (replaces any previous one)"""
+        type_spec = self._type_specs.get(q_type, self._type_specs["general"])
+        options.setdefault("good_feedback", type_spec.get("good_feedback", "Good answer."))
+        options.setdefault("weak_feedback", type_spec.get("weak_feedback", "Needs more detail."))
+        rubric = Rubric(keywords, q_type, **options)
+        with self._lock:
+            previous = self._by_question.get(question)
+            self._by_question[question] = rubric
+        if previous is not None and previous.version != rubric.version:
+            self._notify(question)
+        return rubric
+
+    def register_questions(self, questions):
+        """Compile rubrics for question dicts that carry a "keywords" list"""
+        for q in questions:
+            if isinstance(q, dict) and q.get("keywords"):
+                self.register_question(q["question"], q["keywords"], q.get("type", "definition"))
+
+    def for_type(self, q_type):
+        rubric = self._by_type.get(q_type)
+        if rubric is None:
+            spec = self._type_specs.get(q_type) or self._type_specs["general"]
+            options = {k: v for k, v in spec.items() if k != "keywords"}
+            rubric = Rubric(spec["keywords"], q_type, **options)
+            with self._lock:
+                self._by_type[q_type] = rubric
+        return rubric
+
+    def get(self, question=None, q_type="definition"):
+        """Return the rubric for a question, or for its type"""
+        if self._loaders:
+            self._run_loaders()
+        if question is not None:
+            rubric = self._by_question.get(question)
+            if rubric is not None:
+                return rubric
+        return self.for_type(q_type)
+
+
+_rubric_book = RubricBook()
+
+
+def get_rubric_book():
+    """Return the process-wide rubric registry"""
+    return _rubric_book
@@ -0,0 +1,254 @@
+# semantic_scorer.py
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from interview_engine import evaluate_answer
+from rubric import get_rubric_book, tokenize
+
+# Resolved from this file so imports work from any working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+REFERENCE_FILE = os.path.join(DATA_DIR, "reference_answers.json")
+INDEX_DIR = os.path.join(DATA_DIR, "semantic_index")
+INDEX_VERSION = 1
+VECTOR_DIM = 4096            # Hashed TF-IDF feature buckets
+
+SEMANTIC_WEIGHT = 0.7        # Share of the final score from semantic similarity
+SIMILARITY_FLOOR = 0.03      # Cosine at or below this scores 0
+SIMILARITY_CEIL = 0.25       # Cosine at or above this scores 10
+LATENCY_BUDGET_MS = 50       # Slower semantic scoring falls back to keywords
+MAX_BUDGET_MISSES = 3        # Consecutive misses before semantic scoring is disabled
+
+_STOPWORDS = frozenset(
+    "a an the and or of to in on for is are was were be been it its this that these "
+    "those with as by at from so such can may also which who what when how why i you "
+    "we they he she them our your their my me do does did not no".split()
+)
+
+
+# -------------------------
+# Hashed TF-IDF vectors
+# -------------------------
+def _features(text):
+    """Content-word unigrams and bigrams of a text"""
+    words = [t for t in tokenize(text) if t not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _bucket(feature):
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(feature.encode("utf-8")) % VECTOR_DIM
+
+
+def _term_vector(text, idf):
+    """Sublinear TF-IDF vector, L2-normalized"""
+    vec = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for feature, count in Counter(_features(text)).items():
+        vec[_bucket(feature)] += 1.0 + math.log(count)
+    vec *= idf
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+# -------------------------
+# Index build (run once, or when reference answers change)
+# -------------------------
+def build_index(reference_path=REFERENCE_FILE, index_dir=INDEX_DIR):
+    """
+    Encode every reference answer into a float32 matrix saved as .npy,
+    with question -> row range metadata, so scoring can memory-map it.
+    """
+    with open(reference_path, "rb") as f:
+        raw = f.read()
+    references = json.loads(raw.decode("utf-8"))
+
+    documents = []
+    questions = {}
+    for question, answers in references.items():
+        questions[question] = [len(documents), len(documents) + len(answers)]
+        documents.extend(answers)
+
+    # Document frequency per bucket over the reference corpus
+    df = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for doc in documents:
+        for bucket in {_bucket(f) for f in _features(doc)}:
+            df[bucket] += 1
+    idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+
+    matrix = np.stack([_term_vector(doc, idf) for doc in documents]) if documents else \
+        np.zeros((0, VECTOR_DIM), dtype=np.float32)
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, "references.npy"), matrix)
+    np.save(os.path.join(index_dir, "idf.npy"), idf)
+    meta = {
+        "version": INDEX_VERSION,
+        "dim": VECTOR_DIM,
+        "source_sha256": hashlib.sha256(raw).hexdigest(),
+        "questions": questions
+    }
+    # Metadata last: a crashed build leaves no valid-looking index
+    tmp_path = os.path.join(index_dir, "meta.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(index_dir, "meta.json"))
+    return meta
+
+
+def _index_is_current(reference_path, index_dir):
+    try:
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(reference_path, "rb") as f:
+            source_sha256 = hashlib.sha256(f.read()).hexdigest()
+    except (OSError, ValueError):
+        return False
+    return (meta.get("version") == INDEX_VERSION and meta.get("dim") == VECTOR_DIM
+            and meta.get("source_sha256") == source_sha256)
+
+
+# -------------------------
+# Semantic scorer
+# -------------------------
+class SemanticScorer:
+    """
+    Scores answers by cosine similarity to reference answers.
+    Reference vectors are memory-mapped from the prebuilt index, so each
+    answer costs one encode and one small matrix-vector product. Falls
+    back to the keyword rubric when a question has no reference answers,
+    when scoring exceeds the latency budget, or after repeated misses.
+    """
+
+    def __init__(self, reference_path=REFERENCE_FILE, index_dir=INDEX_DIR,
+                 budget_ms=LATENCY_BUDGET_MS, weight=SEMANTIC_WEIGHT):
+        self.budget_ms = budget_ms
+        self.weight = weight
+        self.enabled = True
+        self.budget_misses = 0       # Consecutive calls over budget
+        self.last_latency_ms = 0.0
+
+        if not _index_is_current(reference_path, index_dir):
+            build_index(reference_path, index_dir)
+
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self._questions = meta["questions"]
+        # Scorer name for EvalCache keys; changes when the reference answers do
+        self.cache_tag = f"semantic:{meta['source_sha256'][:12]}:{weight}"
+        self._references = np.load(os.path.join(index_dir, "references.npy"), mmap_mode="r")
+        self._idf = np.load(os.path.join(index_dir, "idf.npy"))
+
+    def has_reference(self, question):
+        return question in self._questions
+
+    def similarity(self, answer, question):
+        """Best cosine similarity between the answer and the question's references"""
+        start, end = self._questions[question]
+        sims = self._references[start:end] @ _term_vector(answer, self._idf)
+        return float(sims.max()) if len(sims) else 0.0
+
+    def evaluate(self, answer, q_type="definition", question=None):
+        """Blend semantic and keyword scores; same result shape as evaluate_answer"""
+        keyword_result = evaluate_answer(answer, q_type, question)
+        keyword_result["scorer"] = "keyword"
+
+        if not self.enabled:
+            keyword_result["fallback_reason"] = "latency budget"
+            return keyword_result
+        if not answer.strip() or not self.has_reference(question):
+            return keyword_result
+
+        start = time.perf_counter()
+        sim = self.similarity(answer, question)
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+
+        if self.last_latency_ms > self.budget_ms:
+            self.budget_misses += 1
+            if self.budget_misses >= MAX_BUDGET_MISSES:
+                self.enabled = False
+                print("[Semantic] Latency budget missed repeatedly; using keyword scoring")
+            keyword_result["fallback_reason"] = "latency budget"
+            return keyword_result
+        self.budget_misses = 0
+
+        fraction = (sim - SIMILARITY_FLOOR) / (SIMILARITY_CEIL - SIMILARITY_FLOOR)
+        semantic_score = 10 * min(1.0, max(0.0, fraction))
+        score = round(self.weight * semantic_score + (1 - self.weight) * keyword_result["score"])
+
+        rubric = get_rubric_book().get(question, q_type)
+        result = dict(keyword_result)
+        result.update({
+            "score": score,
+            "feedback": rubric.good_feedback if score > rubric.pass_score else rubric.weak_feedback,
+            "keyword_score": keyword_result["score"],
+            "semantic_score": round(semantic_score, 1),
+            "semantic_similarity": round(sim, 3),
+            "latency_ms": round(self.last_latency_ms, 2),
+            "scorer": "semantic"
+        })
+        return result
+
+
+_semantic_scorer = None
+_semantic_failed = False         # Index could not be built or loaded; keyword scoring only
+_semantic_lock = threading.Lock()
+
+
+def get_semantic_scorer(block=True):
+    """
+    Return the process-wide semantic scorer (builds the index on first use
+    if stale), or None when the reference answers or index are unusable.
+    With block=False, returns None instead of waiting for a build in progress.
+    """
+    global _semantic_scorer, _semantic_failed
+    if _semantic_scorer is not None or _semantic_failed:
+        return _semantic_scorer
+    if not _semantic_lock.acquire(blocking=block):
+        return None
+    try:
+        if _semantic_scorer is None and not _semantic_failed:
+            try:
+                _semantic_scorer = SemanticScorer()
+            except (OSError, ValueError, KeyError) as e:
+                print("[Semantic] Index unavailable; using keyword scoring:", e)
+                _semantic_failed = True
+        return _semantic_scorer
+    finally:
+        _semantic_lock.release()
+
+
+def warm_up_semantic_scorer(background=True):
+    """Build or load the reference index at app start instead of on the first answer"""
+    if background:
+        threading.Thread(target=get_semantic_scorer, daemon=True).start()
+    else:
+        get_semantic_scorer()
+
+
+# -------------------------
+# Build entry point
+# -------------------------
+if __name__ == "__main__":
+    meta = build_index()
+    print(f"Indexed {sum(e - s for s, e in meta['questions'].values())} reference answers "
+          f"for {len(meta['questions'])} questions")
+
+    scorer = SemanticScorer()
+    question = "What is overfitting?"
+    for answer in [
+        "When a model memorizes the training set and fails to generalize to new data.",
+        "class method data learning program object-oriented",
+    ]:
+        result = scorer.evaluate(answer, "definition", question)
+        print(f"{result['score']:>2} (sim {result['semantic_similarity']}, "
+              f"{result['latency_ms']} ms): {answer}")
@@ -0,0 +1,361 @@
+# session_export.py
+
+"""
+Columnar archive of saved interview sessions.
+
+Converts session_*.json files (SessionManager.save_session output) into
+compressed column files, one row per answer, and answers aggregate
+queries with vectorized NumPy operations instead of one json.load per
+session. Re-running the export appends only files not yet archived.
+
+Parts are Parquet (zstd) when pyarrow is installed, otherwise
+compressed NumPy .npz. Text columns (role, question, type) are stored as
+integer codes into an append-only vocabulary kept in the manifest.
+
+Usage:
+    python session_export.py sessions/ archive/ --workers 4
+    python session_export.py sessions/ archive/ --compact    # merge parts
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+ARCHIVE_VERSION = 1
+CHUNK_SIZE = 2000            # Session files parsed per worker task
+TEXT_COLUMNS = ("role", "question", "type")
+COLUMN_TYPES = {
+    "session": np.int64,     # Archive-wide session number
+    "role": np.int32,
+    "question": np.int32,
+    "type": np.int16,
+    "score": np.float32,
+    "answer_words": np.int32,
+    "started": np.int64      # Unix seconds, -1 if unknown
+}
+# session_<start time>_<suffix>.json, as written by SessionManager.save_session
+_SESSION_FILE = re.compile(r"session_(\d{4}-\d\d-\d\d_\d\d-\d\d-\d\d_[0-9a-f]{8})\.json$")
+
+
+# -------------------------
+# Parsing (runs in worker processes)
+# -------------------------
+def _started(start_time):
+    try:
+        return int(datetime.strptime(start_time, "%Y-%m-%d_%H-%M-%S").timestamp())
+    except (TypeError, ValueError):
+        return -1
+
+
+def _parse_files(paths):
+    """
+    [(path, session ID or None, session rows or None)] with rows as
+    (role, question, type, score, words, started)
+    """
+    parsed = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Export] Skipping {path}: {e}")
+            parsed.append((path, None, None))
+            continue
+        role = session.get("role", "Unknown")
+        started = _started(session.get("start_time"))
+        parsed.append((path, session.get("session_id"), [
+            (role, q.get("question") or "", q.get("type", "definition"), float(q.get("score", 0)),
+             len((q.get("answer") or "").split()), started)
+            for q in session.get("questions", [])
+        ]))
+    return parsed
+
+
+def _source_key(path, session_id=None):
+    """
+    Archive key of a session file: its session ID (from the JSON or the
+    file name), so a moved folder is not archived twice; older files
+    without an ID fall back to path + size + mtime.
+    """
+    if session_id is None:
+        match = _SESSION_FILE.search(os.path.basename(path))
+        if match:
+            session_id = match.group(1)
+    if session_id is not None:
+        return f"id:{session_id}"
+    stat = os.stat(path)
+    return f"file:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _iter_parsed(paths, workers):
+    chunks = [paths[i:i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _parse_files(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for parsed in executor.map(_parse_files, chunks):
+            yield from parsed
+
+
+# -------------------------
+# Archive
+# -------------------------
+class SessionArchive:
+    """
+    A folder of column parts plus manifest.json (parts, vocabularies,
+    session count). Each part has a .sources list of the files it holds;
+    only parts named in the manifest count, so an interrupted append
+    leaves nothing half-archived.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._columns = {}           # Loaded column cache
+        self.manifest = self._read_manifest()
+        self._codes = {name: {value: i for i, value in enumerate(values)}
+                       for name, values in self.manifest["vocab"].items()}
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.path, "manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == ARCHIVE_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {
+            "version": ARCHIVE_VERSION,
+            "format": "parquet" if pa is not None else "npz",
+            "sessions": 0,
+            "next_part": 0,
+            "parts": [],
+            "vocab": {name: [] for name in TEXT_COLUMNS}
+        }
+
+    @property
+    def rows(self):
+        return sum(part["rows"] for part in self.manifest["parts"])
+
+    # -------------------------
+    # Writing
+    # -------------------------
+    def _source_lines(self):
+        """Every .sources line: "<key>\t<path>" (the oldest parts hold just the path)"""
+        lines = []
+        for part in self.manifest["parts"]:
+            with open(os.path.join(self.path, part["sources"]), "r", encoding="utf-8") as f:
+                lines.extend(line.rstrip("\n") for line in f)
+        return lines
+
+    def archived_sources(self):
+        """(keys, paths) of every archived session file"""
+        keys = set()
+        paths = set()
+        for line in self._source_lines():
+            key, _, path = line.rpartition("\t")
+            keys.add(key)
+            paths.add(path)
+        return keys, paths
+
+    def append(self, folder, workers=None):
+        """
+        Archive session files from folder that are not archived yet, as
+        one new part. Only new files are read. Returns (sessions added,
+        answer rows added).
+        """
+        os.makedirs(self.path, exist_ok=True)
+        done_keys, done_paths = self.archived_sources()
+        keys = {}
+        for path in sorted(glob.glob(os.path.join(folder, "session_*.json"))):
+            path = os.path.abspath(path)
+            if path in done_paths:
+                continue
+            try:
+                key = _source_key(path)
+            except OSError as e:
+                print(f"[Export] Skipping {path}: {e}")
+                continue
+            if key not in done_keys:
+                keys[path] = key
+        paths = list(keys)
+        if not paths:
+            return 0, 0
+
+        columns = {name: [] for name in COLUMN_TYPES}
+        added = []
+        session_number = self.manifest["sessions"]
+        for path, session_id, rows in _iter_parsed(paths, workers or os.cpu_count()):
+            if rows is None:
+                continue
+            # The ID inside the file wins over one guessed from its name
+            key = _source_key(path, session_id) if session_id else keys[path]
+            if key in done_keys:
+                continue  # Same session under another name
+            done_keys.add(key)
+            for role, question, q_type, score, words, started in rows:
+                columns["session"].append(session_number)
+                columns["role"].append(self._code("role", role))
+                columns["question"].append(self._code("question", question))
+                columns["type"].append(self._code("type", q_type))
+                columns["score"].append(score)
+                columns["answer_words"].append(words)
+                columns["started"].append(started)
+            session_number += 1
+            added.append(f"{key}\t{path}")
+        if not added:
+            return 0, 0  # Nothing parsed; no empty part
+
+        arrays = {name: np.asarray(values, dtype=COLUMN_TYPES[name])
+                  for name, values in columns.items()}
+        part = self._write_part(arrays, added)
+
+        # Manifest last: a crash mid-append leaves the archive as it was
+        self.manifest["parts"].append(part)
+        self.manifest["sessions"] = session_number
+        self._write_manifest()
+
+        self._columns.clear()
+        return len(added), part["rows"]
+
+    def _code(self, name, value):
+        code = self._codes[name].get(value)
+        if code is None:
+            code = len(self.manifest["vocab"][name])
+            self.manifest["vocab"][name].append(value)
+            self._codes[name][value] = code
+        return code
+
+    def compact(self):
+        """Merge every part into one (fewer files to open per query)"""
+        if len(self.manifest["parts"]) < 2:
+            return
+        arrays = {name: self.column(name) for name in COLUMN_TYPES}
+        old_files = [f for part in self.manifest["parts"] for f in (part["file"], part["sources"])]
+        self.manifest["parts"] = [self._write_part(arrays, self._source_lines())]
+        self._write_manifest()
+        for filename in old_files:
+            os.remove(os.path.join(self.path, filename))
+
+    def _write_part(self, arrays, sources):
+        """Write one part and its source lines; returns its manifest entry"""
+        number = self.manifest["next_part"]
+        self.manifest["next_part"] += 1
+        sources_name = f"part-{number:05d}.sources"
+        with open(os.path.join(self.path, sources_name), "w", encoding="utf-8") as f:
+            f.writelines(p + "\n" for p in sources)
+
+        if self.manifest["format"] == "parquet":
+            if pa is None:
+                raise RuntimeError("This archive uses Parquet; install pyarrow to append to it")
+            filename = f"part-{number:05d}.parquet"
+            table = pa.table({name: pa.array(values) for name, values in arrays.items()})
+            pq.write_table(table, os.path.join(self.path, filename), compression="zstd")
+        else:
+            filename = f"part-{number:05d}.npz"
+            np.savez_compressed(os.path.join(self.path, filename), **arrays)
+        return {"file": filename, "sources": sources_name, "rows": len(arrays["session"]),
+                "sessions": len(sources)}
+
+    def _write_manifest(self):
+        tmp_path = os.path.join(self.path, "manifest.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, os.path.join(self.path, "manifest.json"))
+
+    # -------------------------
+    # Reading
+    # -------------------------
+    def column(self, name):
+        """One column across every part (loaded once, then cached)"""
+        if name not in self._columns:
+            parts = [self._read_part_column(part["file"], name) for part in self.manifest["parts"]]
+            self._columns[name] = (np.concatenate(parts) if parts
+                                   else np.zeros(0, dtype=COLUMN_TYPES[name]))
+        return self._columns[name]
+
+    def _read_part_column(self, filename, name):
+        path = os.path.join(self.path, filename)
+        if filename.endswith(".parquet"):
+            if pa is None:
+                raise RuntimeError("This archive uses Parquet; install pyarrow to read it")
+            return pq.read_table(path, columns=[name]).column(name).to_numpy()
+        with np.load(path) as part:
+            return part[name]
+
+    def mask(self, role=None, question=None, q_type=None, score_range=None):
+        """Boolean row mask for the given filters (score_range is inclusive (low, high))"""
+        selected = np.ones(self.rows, dtype=bool)
+        for name, value in (("role", role), ("question", question), ("type", q_type)):
+            if value is not None:
+                code = self._codes[name].get(value, -1)
+                selected &= self.column(name) == code
+        if score_range is not None:
+            scores = self.column("score")
+            selected &= (scores >= score_range[0]) & (scores <= score_range[1])
+        return selected
+
+    def count(self, **filters):
+        return int(self.mask(**filters).sum())
+
+    def score_histogram(self, **filters):
+        """Answer counts for each integer score 0..10"""
+        scores = self.column("score")[self.mask(**filters)]
+        return np.bincount(np.clip(scores, 0, 10).astype(np.int64), minlength=11)
+
+    def mean_score_by(self, group="role", **filters):
+        """{group value: (answers, mean score)} for role, question or type"""
+        selected = self.mask(**filters)
+        codes = self.column(group)[selected]
+        scores = self.column("score")[selected]
+        size = len(self.manifest["vocab"][group])
+        counts = np.bincount(codes, minlength=size)
+        totals = np.bincount(codes, weights=scores, minlength=size)
+        return {
+            value: (int(counts[i]), float(totals[i] / counts[i]))
+            for i, value in enumerate(self.manifest["vocab"][group]) if counts[i]
+        }
+
+    def session_totals(self, **filters):
+        """Total score of every archived session (rows filtered first)"""
+        selected = self.mask(**filters)
+        return np.bincount(self.column("session")[selected],
+                           weights=self.column("score")[selected],
+                           minlength=self.manifest["sessions"])
+
+
+# -------------------------
+# Entry Point
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export saved sessions to a columnar archive")
+    parser.add_argument("folder", nargs="?", default="sessions", help="Session JSON folder")
+    parser.add_argument("archive", nargs="?", default="sessions/archive", help="Archive folder")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Parser processes")
+    parser.add_argument("--compact", action="store_true", help="Merge all parts into one")
+    args = parser.parse_args()
+
+    archive = SessionArchive(args.archive)
+    sessions, rows = archive.append(args.folder, workers=args.workers)
+    if args.compact:
+        archive.compact()
+    print(f"Appended {sessions} sessions ({rows} answers); archive holds "
+          f"{archive.manifest['sessions']} sessions in {len(archive.manifest['parts'])} "
+          f"{archive.manifest['format']} parts")
+
+    print("Mean score by role:")
+    for role, (answers, mean) in sorted(archive.mean_score_by("role").items()):
+        print(f"  {role:<20} {mean:5.2f}  ({answers} answers)")
+    print("Score distribution:", archive.score_histogram().tolist())
@@ -1,62 +1,246 @@
 # session_manager.py
 
+import glob
 import json
 import os
+import threading
+import time
+import uuid
 from datetime import datetime
 
 SESSION_DIR = "sessions"
+FSYNC_EVERY = 8              # Journal records between fsyncs
+FSYNC_INTERVAL = 1.0         # ...or seconds since the last fsync, whichever comes first
 
 # Ensure session directory exists
 if not os.path.exists(SESSION_DIR):
     os.makedirs(SESSION_DIR)
 
+# -------------------------
+# Append-only journal
+# -------------------------
+class SessionJournal:
+    """
+    Line-delimited JSON log of one session. Every record is written and
+    flushed as it happens; fsync is batched (every FSYNC_EVERY records or
+    FSYNC_INTERVAL seconds) so answers are durable without a disk sync
+    per keystroke-sized write. A timer syncs the last records of a burst,
+    so nothing stays unsynced longer than FSYNC_INTERVAL.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer = None           # Pending background sync
+
+    def append(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            wait = FSYNC_INTERVAL - (time.monotonic() - self._last_sync)
+            if self._unsynced >= FSYNC_EVERY or wait <= 0:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self._timed_sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._unsynced and not self._file.closed:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timed_sync(self):
+        with self._lock:
+            self._timer = None
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    @staticmethod
+    def read(path, repair=False):
+        """
+        Return the journal's records, ignoring a torn last line.
+        repair=True truncates the torn line so new records can be appended.
+        """
+        records = []
+        valid_bytes = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    records.append(json.loads(line))
+                except ValueError:
+                    break  # Partial write from a crash; everything before it is intact
+                valid_bytes += len(line)
+        if repair and valid_bytes < os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return records
+
+
 class SessionManager:
     """
     Manages an interview session:
     - Stores each question, answer, score, and camera feedback
-    - Can save session to JSON file
+    - Journals every answer to disk as it is added (crash-safe)
+    - Can save session to JSON file, or to a SessionStore (SQLite)
     """
 
-    def __init__(self, role):
+    def __init__(self, role, session_dir=SESSION_DIR, journal=True, store=None):
         self.role = role
+        self.session_dir = session_dir
+        self.store = store  # SessionStore backend; None saves JSON files
         self.start_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        # Unique even for sessions started in the same second
+        self.session_id = f"{self.start_time}_{uuid.uuid4().hex[:8]}"
+        self._started = time.monotonic()
         self.questions = []  # List of dicts: {question, answer, score, camera_feedback}
+        self.camera_samples = []  # Periodic camera readings during the session
+        self._total_score = 0
+        self._journal_enabled = journal
+        self._journal = None  # Opened on the first answer
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.session_dir, f"session_{self.session_id}.journal")
 
-    def add_question(self, question_text, answer_text, score, camera_feedback):
+    def add_question(self, question_text, answer_text, score, camera_feedback, q_type="definition"):
         """
         Add a answered question to the session
         """
-        self.questions.append({
+        entry = {
             "question": question_text,
+            "type": q_type,
             "answer": answer_text,
             "score": score,
             "camera_feedback": camera_feedback
-        })
+        }
+        self.questions.append(entry)
+        self._total_score += score
+
+        self._log(dict(entry, event="answer"))
+
+    def add_camera_sample(self, score, feedback):
+        """Record a live camera reading (get_live_camera_feedback()) for the current question"""
+        sample = {
+            "position": len(self.questions),
+            "offset_seconds": round(time.monotonic() - self._started, 2),
+            "score": score,
+            "feedback": feedback
+        }
+        self.camera_samples.append(sample)
+        self._log(dict(sample, event="camera"))
+
+    def _log(self, record):
+        """Append a record to the journal, opening it on first use"""
+        if not self._journal_enabled:
+            return
+        if self._journal is None:
+            self._journal = SessionJournal(self.journal_path)
+            self._journal.append({"event": "start", "role": self.role,
+                                  "start_time": self.start_time,
+                                  "session_id": self.session_id})
+        self._journal.append(record)
 
     def total_score(self):
         """
         Return total session score
         """
-        return sum(q["score"] for q in self.questions)
+        return self._total_score
 
     def save_session(self):
         """
-        Save the session as a JSON file with timestamp
+        Save the session as a JSON file with timestamp (returns its path),
+        or into the store (returns the session ID).
+        The journal is compacted into this final record and removed.
         """
         session_data = {
+            "session_id": self.session_id,
             "role": self.role,
             "start_time": self.start_time,
             "total_score": self.total_score(),
             "questions_answered": len(self.questions),
             "questions": self.questions
         }
+        if self.camera_samples:
+            session_data["camera_samples"] = self.camera_samples
+
+        if self.store is not None:
+            saved = self.store.save(session_data)
+        else:
+            saved = self._write_json(session_data)
 
-        filename = f"{SESSION_DIR}/session_{self.start_time}.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(session_data, f, indent=4)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
 
+        return saved
+
+    def _write_json(self, session_data):
+        filename = f"{self.session_dir}/session_{self.session_id}.json"
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(session_data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
         return filename
 
+    def close(self):
+        """Sync and close the journal without saving (the session stays recoverable)"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    # -------------------------
+    # Recovery
+    # -------------------------
+    @classmethod
+    def from_journal(cls, path, store=None):
+        """Rebuild an in-progress session from its journal; new answers append to it"""
+        records = SessionJournal.read(path, repair=True)
+        start = records[0] if records and records[0].get("event") == "start" else {}
+        session = cls(start.get("role", "Unknown"), session_dir=os.path.dirname(path) or ".",
+                      store=store)
+        session.session_id = os.path.basename(path)[len("session_"):-len(".journal")]
+        session.start_time = start.get("start_time") or session.session_id
+
+        for record in records:
+            if record.get("event") == "answer":
+                entry = {k: v for k, v in record.items() if k != "event"}
+                session.questions.append(entry)
+                session._total_score += entry.get("score", 0)
+            elif record.get("event") == "camera":
+                session.camera_samples.append({k: v for k, v in record.items() if k != "event"})
+        session._journal = SessionJournal(path)
+        return session
+
+    @classmethod
+    def recover(cls, session_dir=SESSION_DIR, store=None):
+        """Sessions left unsaved by a crash (one per leftover journal)"""
+        return [cls.from_journal(path, store)
+                for path in sorted(glob.glob(os.path.join(session_dir, "session_*.journal")))]
+
     def summary(self):
         """
         Return a summary string of the session
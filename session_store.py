@@ -0,0 +1,263 @@
+# session_store.py
+
+"""
+SQLite storage for interview sessions.
+
+One WAL-mode database holds every session, its answers and its camera
+samples, indexed by role, date and score, so analytics run as indexed
+queries instead of loading every session file.
+
+Usage:
+    python session_store.py --import sessions/          # bulk-load session_*.json
+    python session_store.py --role "Data Analyst"       # averages + daily trend
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DB_FILE = "sessions/sessions.db"
+SCHEMA_VERSION = 1
+IMPORT_BATCH = 500           # Session files per import transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    role TEXT NOT NULL,
+    started_at TEXT NOT NULL,            -- ISO 'YYYY-MM-DD HH:MM:SS'
+    total_score REAL NOT NULL DEFAULT 0,
+    questions_answered INTEGER NOT NULL DEFAULT 0,
+    source TEXT UNIQUE                   -- Imported JSON file, if any
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question TEXT,
+    type TEXT,
+    answer TEXT,
+    score REAL NOT NULL DEFAULT 0,
+    camera_feedback TEXT
+);
+CREATE TABLE IF NOT EXISTS camera_samples (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER,                    -- Question being answered, if known
+    offset_seconds REAL,
+    score REAL,
+    feedback TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_role_date ON sessions(role, started_at);
+CREATE INDEX IF NOT EXISTS sessions_date ON sessions(started_at);
+CREATE INDEX IF NOT EXISTS sessions_score ON sessions(total_score);
+CREATE INDEX IF NOT EXISTS answers_session ON answers(session_id, position);
+CREATE INDEX IF NOT EXISTS answers_question_score ON answers(question, score);
+CREATE INDEX IF NOT EXISTS camera_samples_session ON camera_samples(session_id);
+"""
+
+
+def _iso_time(start_time):
+    """SessionManager start_time ('%Y-%m-%d_%H-%M-%S') -> ISO text SQLite can group by"""
+    try:
+        return datetime.strptime(start_time, "%Y-%m-%d_%H-%M-%S").strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return str(start_time or "")
+
+
+class SessionStore:
+    """
+    Session database (SQLite, WAL mode). Writers never block readers, so
+    the app can save while a dashboard queries. Sessions get integer IDs,
+    so two sessions started in the same second no longer collide.
+    """
+
+    def __init__(self, db_path=DB_FILE):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def _insert(self, session_data, source=None):
+        questions = session_data.get("questions", [])
+        cursor = self._db.execute(
+            "INSERT INTO sessions (role, started_at, total_score, questions_answered, source) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                session_data.get("role", "Unknown"),
+                _iso_time(session_data.get("start_time")),
+                session_data.get("total_score", sum(q.get("score", 0) for q in questions)),
+                session_data.get("questions_answered", len(questions)),
+                source
+            )
+        )
+        session_id = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO answers (session_id, position, question, type, answer, score, camera_feedback) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (session_id, i, q.get("question"), q.get("type", "definition"), q.get("answer"),
+                 q.get("score", 0), q.get("camera_feedback"))
+                for i, q in enumerate(questions)
+            ]
+        )
+        self._db.executemany(
+            "INSERT INTO camera_samples (session_id, position, offset_seconds, score, feedback) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (session_id, s.get("position"), s.get("offset_seconds"), s.get("score"),
+                 s.get("feedback"))
+                for s in session_data.get("camera_samples", [])
+            ]
+        )
+        return session_id
+
+    def save(self, session_data):
+        """Store one session dict (SessionManager.save_session format); returns its ID"""
+        with self._lock, self._db:
+            return self._insert(session_data)
+
+    def import_json(self, folder):
+        """
+        Bulk-load session_*.json files from folder. Files already imported
+        are skipped, so the import can be re-run as new files arrive.
+        Returns (imported, skipped) counts.
+        """
+        with self._lock:
+            known = {row[0] for row in self._db.execute(
+                "SELECT source FROM sessions WHERE source IS NOT NULL")}
+        paths = [p for p in sorted(glob.glob(os.path.join(folder, "session_*.json")))
+                 if os.path.abspath(p) not in known]
+
+        imported = 0
+        skipped = 0
+        for start in range(0, len(paths), IMPORT_BATCH):
+            with self._lock, self._db:
+                for path in paths[start:start + IMPORT_BATCH]:
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            session_data = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"[Sessions] Skipping {path}: {e}")
+                        skipped += 1
+                        continue
+                    self._insert(session_data, source=os.path.abspath(path))
+                    imported += 1
+        return imported, skipped
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def role_averages(self):
+        """Per role: sessions, answers, mean answer score and mean session total"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT s.role, COUNT(DISTINCT s.id) AS sessions, COUNT(a.id) AS answers, "
+                "AVG(a.score) AS avg_score, "
+                "(SELECT AVG(total_score) FROM sessions WHERE role = s.role) AS avg_total "
+                "FROM sessions s LEFT JOIN answers a ON a.session_id = s.id "
+                "GROUP BY s.role ORDER BY s.role"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def role_trend(self, role, period="day", since=None):
+        """
+        Mean answer score per period ("day", "week" or "month") for a role,
+        oldest first. since is an ISO date string lower bound.
+        """
+        formats = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+        query = (
+            f"SELECT strftime('{formats[period]}', s.started_at) AS period, "
+            "COUNT(DISTINCT s.id) AS sessions, AVG(a.score) AS avg_score "
+            "FROM sessions s JOIN answers a ON a.session_id = s.id "
+            "WHERE s.role = ?"
+        )
+        params = [role]
+        if since:
+            query += " AND s.started_at >= ?"
+            params.append(since)
+        query += " GROUP BY period ORDER BY period"
+        with self._lock:
+            return [dict(row) for row in self._db.execute(query, params)]
+
+    def sessions(self, role=None, min_score=None, limit=50):
+        """Most recent sessions, optionally filtered by role and minimum total score"""
+        query = "SELECT id, role, started_at, total_score, questions_answered FROM sessions"
+        conditions = []
+        params = []
+        if role is not None:
+            conditions.append("role = ?")
+            params.append(role)
+        if min_score is not None:
+            conditions.append("total_score >= ?")
+            params.append(min_score)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(query, params)]
+
+    def answers(self, session_id):
+        with self._lock:
+            return [dict(row) for row in self._db.execute(
+                "SELECT position, question, type, answer, score, camera_feedback "
+                "FROM answers WHERE session_id = ? ORDER BY position", (session_id,))]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_session_store = None
+
+
+def get_session_store():
+    """Return the process-wide session store (sessions/sessions.db)"""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore()
+    return _session_store
+
+
+# -------------------------
+# Entry Point
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session database import and reports")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database path")
+    parser.add_argument("--import", dest="import_folder", default=None,
+                        help="Import session_*.json files from this folder")
+    parser.add_argument("--role", default=None, help="Show the score trend for this role")
+    parser.add_argument("--period", default="day", choices=["day", "week", "month"])
+    args = parser.parse_args()
+
+    store = SessionStore(args.db)
+    if args.import_folder:
+        imported, skipped = store.import_json(args.import_folder)
+        print(f"Imported {imported} sessions ({skipped} unreadable)")
+
+    print("By role:")
+    for row in store.role_averages():
+        print(f"  {row['role']:<20} {row['sessions']:>6} sessions  "
+              f"mean score {row['avg_score'] or 0:5.2f}  mean total {row['avg_total'] or 0:6.2f}")
+
+    if args.role:
+        print(f"Trend for {args.role}:")
+        for row in store.role_trend(args.role, args.period):
+            print(f"  {row['period']}  {row['avg_score']:5.2f}  ({row['sessions']} sessions)")
+    store.close()
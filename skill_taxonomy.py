@@ -0,0 +1,234 @@
+# skill_taxonomy.py
+
+import json
+import os
+import re
+import threading
+import time
+
+from index_file import read_index, read_source, source_signature, write_index
+
+# Resolved from this file so imports work from any working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SKILLS_FILE = os.path.join(DATA_DIR, "skills.json")
+INDEX_FILE = os.path.join(DATA_DIR, "skills.index")
+INDEX_VERSION = 1            # Bump when the index layout changes
+CHECK_INTERVAL = 2.0         # Seconds between source file change checks
+
+# -------------------------
+# Compiled multi-pattern matcher
+# -------------------------
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace so multi-word skills match across line breaks"""
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill alias.
+    Finds all skills in one pass over the text, only accepts matches on
+    word boundaries ("java" does not match inside "javascript") and
+    reports canonical skill names. Build once and reuse.
+    """
+
+    def __init__(self, taxonomy=None):
+        taxonomy = taxonomy or {}
+        self._goto = [{}]        # state -> {char: next state}
+        self._fail = [0]         # state -> failure link
+        self._out = [[]]         # state -> [(pattern length, canonical name)]
+        self.pattern_count = 0
+
+        for canonical, aliases in taxonomy.items():
+            for alias in set(aliases) | {canonical}:
+                self._add(normalize_text(alias).strip(), canonical)
+        self._build_links()
+
+    def to_state(self):
+        """Plain-data form of the automaton (for the compiled index file)"""
+        return {
+            "goto": self._goto,
+            "fail": self._fail,
+            "out": [[list(o) for o in outs] for outs in self._out],
+            "pattern_count": self.pattern_count
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a matcher from to_state() output without recompiling"""
+        matcher = cls.__new__(cls)
+        matcher._goto = state["goto"]
+        matcher._fail = state["fail"]
+        matcher._out = [[tuple(o) for o in outs] for outs in state["out"]]
+        matcher.pattern_count = state["pattern_count"]
+        return matcher
+
+    def _add(self, pattern, canonical):
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), canonical))
+        self.pattern_count += 1
+
+    def _build_links(self):
+        """Breadth-first construction of failure links"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                link = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                # Inherit matches that end at the same position
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """
+        Return (start, end, canonical) for every word-bounded match,
+        keeping the longest match where matches overlap
+        ("node.js" wins over "node").
+        """
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        matches = []
+        state = 0
+
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for length, canonical in out[state]:
+                start = i - length + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if i + 1 < n and _is_word_char(text[i + 1]) and _is_word_char(ch):
+                    continue
+                matches.append((start, i + 1, canonical))
+
+        # Leftmost-longest, non-overlapping
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        last_end = -1
+        for start, end, canonical in matches:
+            if start >= last_end:
+                selected.append((start, end, canonical))
+                last_end = end
+        return selected
+
+    def extract(self, text):
+        """Return unique canonical skills in order of first appearance"""
+        return list(dict.fromkeys(canonical for _, _, canonical in self.find_all(text)))
+
+
+# -------------------------
+# Taxonomy snapshot & loader
+# -------------------------
+class TaxonomySnapshot:
+    """One immutable version of the taxonomy: skills, templates and matcher"""
+
+    def __init__(self, skills, question_templates, matcher, source_sha256):
+        self.skills = skills
+        self.question_templates = question_templates
+        self.matcher = matcher
+        self.source_sha256 = source_sha256
+
+
+class SkillTaxonomy:
+    """
+    Loads the skill taxonomy and question templates from data/skills.json.
+    The compiled matcher is cached in a marshal index file next to it, so
+    startup skips compilation while the source is unchanged. The source
+    is re-checked every check_interval seconds and, if it changed, a new
+    snapshot is built and swapped in atomically; readers keep using the
+    snapshot they already hold.
+    """
+
+    def __init__(self, source_path=SKILLS_FILE, index_path=INDEX_FILE,
+                 check_interval=CHECK_INTERVAL):
+        self.source_path = source_path
+        self.index_path = index_path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._signature = None       # (mtime, size) of the loaded source
+        self._last_check = 0.0
+        self._snapshot = None
+        self.reload()
+
+    def current(self):
+        """Return the current snapshot, reloading first if the source changed"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            try:
+                if source_signature(self.source_path) != self._signature:
+                    self.reload()
+            except Exception as e:
+                # Keep serving the previous snapshot if the new file is broken
+                print("[Taxonomy] Reload failed:", e)
+        return self._snapshot
+
+    def reload(self):
+        """Load the source (via the compiled index when it is up to date)"""
+        with self._lock:
+            signature = source_signature(self.source_path)
+            raw, source_sha256 = read_source(self.source_path)
+
+            index = read_index(self.index_path, INDEX_VERSION, source_sha256)
+            if index is None:
+                data = json.loads(raw.decode("utf-8"))
+                skills = data["skills"]
+                index = {
+                    "version": INDEX_VERSION,
+                    "source_sha256": source_sha256,
+                    "skills": skills,
+                    "question_templates": data.get("question_templates", []),
+                    "matcher": SkillMatcher(skills).to_state()
+                }
+                write_index(self.index_path, index, "Taxonomy")
+
+            self._snapshot = TaxonomySnapshot(
+                index["skills"],
+                index["question_templates"],
+                SkillMatcher.from_state(index["matcher"]),
+                source_sha256
+            )
+            self._signature = signature
+            self.reloads += 1
+            return self._snapshot
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """Return the current snapshot of the process-wide taxonomy"""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy()
+    return _taxonomy.current()
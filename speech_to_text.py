@@ -1,6 +1,239 @@
 # speech_to_text.py
+import queue
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+
 import speech_recognition as sr
 
+
+# -------------------------
+# Recognizer backends
+# -------------------------
+class RecognizerBackend(ABC):
+    """
+    Turns one chunk of audio into text.
+    Subclass and implement transcribe() to plug in another engine.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, recognizer, audio):
+        """Return the text spoken in one sr.AudioData chunk"""
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (needs network)"""
+
+    name = "google"
+
+    def transcribe(self, recognizer, audio):
+        return recognizer.recognize_google(audio)
+
+
+class SphinxBackend(RecognizerBackend):
+    """CMU Sphinx, fully offline (needs the pocketsphinx package)"""
+
+    name = "sphinx"
+
+    def transcribe(self, recognizer, audio):
+        return recognizer.recognize_sphinx(audio)
+
+
+def _transcribe_chunk(backend, recognizer, audio):
+    """Run a backend on one chunk; unintelligible or failed chunks give ''"""
+    try:
+        return backend.transcribe(recognizer, audio).strip()
+    except sr.UnknownValueError:
+        return ""
+    except sr.RequestError as e:
+        print(f"[Speech] {backend.name} request error:", e)
+        return ""
+
+
+# -------------------------
+# Background listener
+# -------------------------
+class BackgroundListener:
+    """
+    Persistent microphone listener.
+    Keeps one calibrated Recognizer and one open audio stream for the
+    whole app. While a session is active, speech is cut into short
+    chunks that are recognized on a separate thread, and the growing
+    transcript is passed to on_partial after every chunk.
+
+    Every start() begins a numbered session and callbacks are called as
+    callback(transcript, session), so callers can ignore results that
+    arrive after they moved on.
+    """
+
+    def __init__(self, backend=None, chunk_seconds=3, microphone=None):
+        self.backend = backend or GoogleBackend()
+        self.chunk_seconds = chunk_seconds
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = 0.5     # Close chunks on short pauses
+        self.microphone = microphone
+
+        self.transcript = ""
+        self.latencies = []          # Seconds from end of chunk to its text
+        self.on_partial = None
+        self.on_final = None
+
+        self._session = 0
+        self._final_session = 0      # Last session whose on_final has fired
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._calibrated = threading.Event()
+        self._closed = False
+        self._chunks = queue.Queue()
+        self._listen_thread = None
+        self._recognize_thread = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def open(self):
+        """Open the microphone and calibrate once (non-blocking)"""
+        if self._listen_thread is not None:
+            return
+        self._listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
+        self._recognize_thread = threading.Thread(target=self._recognize_loop, daemon=True)
+        self._listen_thread.start()
+        self._recognize_thread.start()
+
+    def start(self, on_partial=None, on_final=None):
+        """Begin a new transcript and return its session ID; callbacks run off the UI thread"""
+        self.open()
+        with self._lock:
+            self._session += 1
+            self.transcript = ""
+            self.on_partial = on_partial
+            self.on_final = on_final
+        self._active.set()
+        print("Listening...")
+        return self._session
+
+    def stop(self, on_final=None):
+        """
+        Stop capturing. on_final fires once every queued and in-flight
+        chunk of the session is recognized; passing on_final here replaces
+        the one given to start() (it runs at once if the session already
+        finished). Returns the session ID.
+        """
+        self._active.clear()
+        with self._lock:
+            session = self._session
+            finished = self._final_session == session
+            if on_final is not None and not finished:
+                self.on_final = on_final
+        if on_final is not None and finished:
+            on_final(self.transcript, session)
+        if self._listen_thread is not None and not self._listen_thread.is_alive():
+            # No capture thread left to queue the end marker (microphone error)
+            self._chunks.put((session, None, None))
+        return session
+
+    def is_listening(self):
+        return self._active.is_set()
+
+    def is_calibrated(self):
+        """True once ambient-noise calibration has run on the open stream"""
+        return self._calibrated.is_set()
+
+    def close(self):
+        """Release the microphone"""
+        self._active.clear()
+        self._closed = True
+        self._chunks.put((None, None, None))
+
+    # -------------------------
+    # Worker threads
+    # -------------------------
+    def _listen_loop(self):
+        try:
+            with (self.microphone or sr.Microphone()) as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                self._calibrated.set()
+
+                marked = 0  # Last session given its end marker
+                while not self._closed:
+                    if not self._active.wait(timeout=0.2):
+                        if self._session != marked:
+                            # Queued after the session's last chunk
+                            marked = self._session
+                            self._chunks.put((marked, None, None))
+                        continue
+                    session = self._session
+                    try:
+                        audio = self.recognizer.listen(
+                            source, timeout=1, phrase_time_limit=self.chunk_seconds
+                        )
+                    except sr.WaitTimeoutError:
+                        continue
+                    self._chunks.put((session, time.perf_counter(), audio))
+        except Exception as e:
+            print("[Speech] Microphone error:", e)
+            traceback.print_exc()
+            self._active.clear()
+
+    def _recognize_loop(self):
+        while True:
+            session, captured_at, audio = self._chunks.get()
+            if session is None:
+                break
+            if session != self._session:
+                continue  # Chunk from an older answer
+
+            if audio is None:
+                with self._lock:
+                    if self._final_session == session:
+                        continue  # Marker queued twice
+                    self._final_session = session
+                    on_final, transcript = self.on_final, self.transcript
+                if on_final:
+                    on_final(transcript, session)
+                continue
+
+            text = _transcribe_chunk(self.backend, self.recognizer, audio)
+            self.latencies.append(time.perf_counter() - captured_at)
+            with self._lock:
+                if not text or session != self._session:
+                    continue
+                self.transcript = f"{self.transcript} {text}".strip()
+                on_partial, transcript = self.on_partial, self.transcript
+            if on_partial:
+                on_partial(transcript, session)
+
+
+# -------------------------
+# Offline helpers (WAV fixtures, latency measurement)
+# -------------------------
+def transcribe_wav(file_path, backend=None, chunk_seconds=3):
+    """
+    Recognize a recorded WAV file the same way the live listener does.
+    Yields (partial_transcript, chunk_latency_seconds) after each chunk.
+    """
+    backend = backend or SphinxBackend()
+    recognizer = sr.Recognizer()
+    transcript = ""
+
+    with sr.AudioFile(file_path) as source:
+        remaining = source.DURATION
+        while remaining > 0:
+            audio = recognizer.record(source, duration=min(chunk_seconds, remaining))
+            remaining -= chunk_seconds
+
+            start = time.perf_counter()
+            text = _transcribe_chunk(backend, recognizer, audio)
+            latency = time.perf_counter() - start
+
+            if text:
+                transcript = f"{transcript} {text}".strip()
+            yield transcript, latency
+
+
 def listen_to_user():
     """Convert speech to text using microphone."""
     r = sr.Recognizer()
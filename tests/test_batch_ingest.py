@@ -0,0 +1,61 @@
+# tests/test_batch_ingest.py
+import json
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+pytest.importorskip("docx")
+import batch_ingest
+from batch_ingest import ingest, load_done, read_records, repair_output
+
+def fake_process_resume(file_path, include_text=False):
+    """Stand-in pipeline: files named bad* fail, the rest get one skill"""
+    if "bad" in file_path:
+        return {"path": file_path, "error": "ValueError: unreadable", "timings": {}}
+    return {"path": file_path, "skills": ["python"], "questions": [], "timings": {"hash": 0.0}}
+
+def fixed_process_resume(file_path, include_text=False):
+    return {"path": file_path, "timings": {}}
+
+def write_lines(path, lines, tail=""):
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + tail)
+
+def test_repair_truncates_torn_last_line(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [{"path": "a"}], tail='{"path": "b", "ski')
+    repair_output(str(output))
+    assert output.read_text() == '{"path": "a"}\n'
+
+    output.write_text('{"pa')  # Only a torn line
+    repair_output(str(output))
+    assert output.read_text() == ""
+
+def test_last_record_per_path_wins(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [{"path": "a", "error": "x"}, {"path": "b", "error": "x"}, {"path": "a"}])
+    assert "error" not in read_records(str(output))["a"]
+    assert load_done(str(output)) == {"a", "b"}
+    assert load_done(str(output), retry_errors=True) == {"a"}
+
+def test_resume_after_interrupted_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_ingest, "process_resume", fake_process_resume)
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    for name in ("one.pdf", "two.docx", "bad.pdf"):
+        (folder / name).write_bytes(b"")
+    one, two, bad = (str(folder / n) for n in ("one.pdf", "two.docx", "bad.pdf"))
+
+    # Killed run: one file done, another from elsewhere, a torn line at the end
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [{"path": one}, {"path": "/elsewhere/x.pdf"}], tail='{"path": "')
+
+    stats = ingest(str(folder), str(output), workers=1)
+    assert (stats["files"], stats["errors"], stats["skipped"]) == (2, 1, 1)
+    records = [json.loads(line) for line in output.read_text().splitlines()]  # No torn line left
+    assert {r["path"] for r in records} == {one, two, bad, "/elsewhere/x.pdf"}
+
+    # A retried file that now succeeds replaces its error record
+    monkeypatch.setattr(batch_ingest, "process_resume", fixed_process_resume)
+    stats = ingest(str(folder), str(output), workers=1, retry_errors=True)
+    assert (stats["files"], stats["skipped"]) == (1, 2)
+    assert "error" not in read_records(str(output))[bad]
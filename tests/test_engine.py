@@ -1,6 +1,6 @@
 # tests/test_engine.py
 import pytest
-from interview_engine import evaluate_answer
+from interview_engine import evaluate_answer, evaluate_batch
 
 def test_definition_answer():
     answer = "Object-oriented programming uses classes and methods."
@@ -15,3 +15,39 @@ def test_programming_answer():
 def test_empty_answer():
     result = evaluate_answer("", "definition")
     assert result["score"] == 0
+
+def test_whole_word_matching():
+    result = evaluate_answer("Classification of information", "definition")
+    assert result["score"] == 0
+
+def test_unknown_type_is_scored():
+    result = evaluate_answer("In my final year project I built an app and learned a lot", "project")
+    assert result["score"] > 0
+    assert "feedback" in result
+
+def test_breakdown_lists_keywords():
+    result = evaluate_answer("A class has methods", "definition")
+    matched = {b["keyword"] for b in result["breakdown"] if b["matched"]}
+    assert matched == {"class", "method"}
+    assert "data" in result["missing"]
+
+def test_batch_matches_single():
+    records = [
+        ("What is OOP?", "definition", "Classes and methods"),
+        (None, "programming", "def f(): return 1"),
+        ("Q", "definition", ""),
+    ]
+    batch = list(evaluate_batch(records, workers=1, chunk_size=2))
+    single = [evaluate_answer(a, t, q) for q, t, a in records]
+    assert [r["score"] for r in batch] == [r["score"] for r in single]
+
+def test_bank_questions_use_their_own_keywords():
+    result = evaluate_answer("It memorizes the training data and fails on unseen data",
+                             "definition", "What is overfitting?")
+    matched = {b["keyword"] for b in result["breakdown"] if b["matched"]}
+    assert matched == {"training", "memorize", "generalize"}
+
+def test_resume_questions_are_general():
+    from resume_question_gen import generate_questions
+    questions = generate_questions(["python"], ["Describe a project where you used {skill}."])
+    assert questions == [{"question": "Describe a project where you used python.", "type": "general"}]
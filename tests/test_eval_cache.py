@@ -0,0 +1,71 @@
+# tests/test_eval_cache.py
+from eval_cache import EvalCache
+from interview_engine import evaluate_answer, evaluate_batch
+from rubric import RubricBook
+
+def test_resubmitted_answer_hits_cache():
+    cache = EvalCache()
+    first = cache.get_or_evaluate("A class has methods.", "definition")
+    second = cache.get_or_evaluate("  a CLASS has methods ", "definition")
+    assert first == second == evaluate_answer("A class has methods.", "definition")
+    assert cache.get_stats()["hits"] == 1
+
+def test_rubric_change_invalidates():
+    book = RubricBook()
+    book.register_question("Q?", ["alpha"])
+    cache = EvalCache(rubric_book=book)
+    evaluate = lambda answer, q_type, question: book.get(question, q_type).score(answer)
+
+    assert cache.get_or_evaluate("alpha beta", question="Q?", evaluate=evaluate)["score"] == 1
+    book.register_question("Q?", ["alpha", "beta"])
+    assert cache.get_stats()["invalidations"] == 1
+    assert cache.get_or_evaluate("alpha beta", question="Q?", evaluate=evaluate)["score"] == 2
+
+def test_disk_tier_and_ttl(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EvalCache(db_path=db_path)
+    cache.get_or_evaluate("A class has methods", "definition")
+    cache.close()
+
+    reopened = EvalCache(db_path=db_path)
+    reopened.get_or_evaluate("A class has methods", "definition")
+    assert reopened.get_stats()["disk_hits"] == 1
+    reopened.close()
+
+    expired = EvalCache(db_path=db_path, ttl=-1)
+    expired.get_or_evaluate("A class has methods", "definition")
+    assert expired.get_stats()["expired"] == 1
+    expired.close()
+
+def test_batch_with_cache_matches_uncached():
+    records = [(None, "definition", "A class has methods"), (None, "programming", "def f(): return 1")] * 3
+    cache = EvalCache()
+    cached = list(evaluate_batch(records, workers=1, chunk_size=2, cache=cache))
+    assert cached == list(evaluate_batch(records, workers=1))
+    assert cache.get_stats()["hits"] == 4
+
+def test_caches_do_not_outlive_their_owner():
+    import gc
+    book = RubricBook()
+    book.register_question("Q?", ["alpha"])
+    kept = EvalCache(rubric_book=book)
+    EvalCache(rubric_book=book)          # Dropped without close()
+    closed = EvalCache(rubric_book=book)
+    closed.close()
+    gc.collect()
+    evaluate = lambda answer, q_type, question: book.get(question, q_type).score(answer)
+    for cache in (kept, closed):
+        cache.get_or_evaluate("alpha", question="Q?", evaluate=evaluate)
+
+    book.register_question("Q?", ["beta"])
+    assert len(book._listeners) == 1
+    assert kept.get_stats()["invalidations"] == 1
+    assert closed.get_stats()["invalidations"] == 0
+
+def test_underscores_are_part_of_the_key():
+    cache = EvalCache()
+    spaced = cache.get_or_evaluate("def f(): return value = 1", "programming")
+    joined = cache.get_or_evaluate("def f(): return_value = 1", "programming")
+    assert joined == evaluate_answer("def f(): return_value = 1", "programming")
+    assert spaced["score"] != joined["score"]
+    cache.close()
@@ -0,0 +1,56 @@
+# tests/test_frame_buffer.py
+import pytest
+
+np = pytest.importorskip("numpy")
+from frame_buffer import FrameBuffer
+
+SHAPE = (4, 4, 3)
+
+def write(buffer, value):
+    slot = buffer.write_slot(SHAPE)
+    slot[:] = value
+    buffer.publish()
+    return slot
+
+def test_read_returns_none_when_nothing_new():
+    buffer = FrameBuffer()
+    assert buffer.read() == (0, None)
+    write(buffer, 1)
+    seq, frame = buffer.read()
+    assert seq == 1 and frame[0, 0, 0] == 1
+    assert not frame.flags.writeable
+    assert buffer.read(since_seq=seq) == (seq, None)
+    buffer.clear()
+    assert buffer.read()[1] is None
+
+def test_leased_frame_is_never_overwritten():
+    buffer = FrameBuffer()
+    write(buffer, 1)
+    seq, frame = buffer.read(lease=True)
+    for value in range(2, 10):  # The writer laps the ring several times
+        assert write(buffer, value) is not frame.base
+    assert (frame == 1).all()
+    assert buffer.swapped == 1
+    assert buffer.read()[1][0, 0, 0] == 9
+
+def test_unleased_slots_are_reused():
+    buffer = FrameBuffer()
+    slots = [write(buffer, value) for value in range(3)]
+    buffer.release(buffer.read(lease=True)[1])  # Lease ended before the writer came back
+    reused = [write(buffer, value) for value in range(3, 6)]
+    assert all(a is b for a, b in zip(slots, reused))
+    assert buffer.swapped == 0
+
+def test_release_after_swap_is_harmless():
+    buffer = FrameBuffer()
+    write(buffer, 1)
+    _, frame = buffer.read(lease=True)
+    for value in range(2, 5):
+        write(buffer, value)  # Swaps out the leased slot
+    buffer.release(frame)
+    buffer.release(None)
+    assert buffer._leases == [0, 0, 0]
+    slots = list(buffer._slots)
+    for value in range(5, 8):
+        write(buffer, value)
+    assert all(a is b for a, b in zip(slots, buffer._slots))
@@ -0,0 +1,57 @@
+# tests/test_interview_agent.py
+from agent.interview_agent import InterviewAgent
+
+def test_peek_returns_the_next_question():
+    agent = InterviewAgent("Software Developer", max_questions=3)
+    asked = []
+    while agent.has_more_questions():
+        peeked = agent.peek_next_question()
+        assert agent.peek_next_question() == peeked
+        asked.append(agent.get_next_question())
+        assert asked[-1] == peeked
+    assert agent.peek_next_question() == (None, None)
+    assert len(set(asked)) == 3
+
+def test_seeded_order_is_reproducible():
+    def order(seed):
+        agent = InterviewAgent("Software Developer", max_questions=4, seed=seed)
+        return [agent.get_next_question() for _ in range(4)], agent.answered_questions
+
+    first, ids = order(7)
+    assert order(7) == (first, ids)
+    assert all(isinstance(i, int) for i in ids)
+
+def test_custom_pool_is_exhausted_without_repeats():
+    agent = InterviewAgent("Software Developer", max_questions=5, seed=1)
+    agent.load_custom_questions([{"question": f"Q{i}", "type": "project"} for i in range(3)])
+    asked = [agent.get_next_question()[0] for _ in range(3)]
+    assert sorted(asked) == ["Q0", "Q1", "Q2"]
+    assert agent.get_next_question() == (None, None)
+
+def test_adaptive_agent_follows_ability():
+    def difficulties(score):
+        agent = InterviewAgent("Software Developer", max_questions=5, seed=3, adaptive=True)
+        asked = []
+        while agent.has_more_questions():
+            agent.get_next_question()
+            asked.append(agent.question_by_id(agent.answered_questions[-1])["difficulty"])
+            agent.record_score(score)
+        return asked, agent.ability.ability
+
+    strong, strong_ability = difficulties(10)
+    weak, weak_ability = difficulties(0)
+    assert strong_ability > 0 > weak_ability
+    assert sum(strong[1:]) > sum(weak[1:])
+
+def test_record_score_keeps_peeked_question_that_still_fits():
+    agent = InterviewAgent("Software Developer", max_questions=5, seed=3, adaptive=True)
+    agent.get_next_question()
+    peeked = agent.peek_next_question()
+    agent.record_score(5)  # Expected score for a 0.0 question: estimate barely moves
+    assert agent.peek_next_question() == peeked
+    assert agent.get_next_question() == peeked
+
+def test_custom_string_questions_are_general():
+    agent = InterviewAgent("Software Developer", max_questions=5)
+    agent.load_custom_questions(["Tell me about your python project."])
+    assert agent.get_next_question() == ("Tell me about your python project.", "general")
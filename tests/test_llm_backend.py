@@ -0,0 +1,48 @@
+# tests/test_llm_backend.py
+import asyncio
+
+from llm_backend import LLMEvaluator
+from llm_stub_server import StubLLMServer
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def _evaluate(server, answers, **options):
+    await server.start()
+    evaluator = LLMEvaluator(server.base_url, backoff_base=0.01, **options)
+    tokens = []
+    try:
+        results = await asyncio.gather(*(
+            evaluator.evaluate("What is an API?", a, on_token=tokens.append) for a in answers
+        ))
+    finally:
+        evaluator.close()
+        await server.stop()
+    return evaluator, results, tokens
+
+def test_streams_tokens_and_parses_score():
+    answer = "An API is a contract that lets programs talk to each other"
+    _, results, tokens = run(_evaluate(StubLLMServer(), [answer]))
+    assert results[0]["scorer"] == "llm"
+    assert "".join(tokens) == results[0]["feedback"]
+    assert 0 < results[0]["score"] <= 10
+
+def test_connections_are_pooled():
+    evaluator, results, _ = run(_evaluate(StubLLMServer(), ["answer"] * 12, max_concurrency=3))
+    assert len(results) == 12
+    assert evaluator.pool.opened <= 3
+
+def test_retries_then_succeeds():
+    evaluator, results, _ = run(_evaluate(StubLLMServer(fail_first=2), ["some answer"]))
+    assert results[0]["scorer"] == "llm"
+    assert evaluator.retries == 2
+
+def test_falls_back_to_keywords_after_retries():
+    evaluator, results, _ = run(_evaluate(StubLLMServer(fail_first=10), ["A class has methods"], max_retries=1))
+    assert results[0]["scorer"] == "keyword"
+    assert "fallback_reason" in results[0]
+
+def test_timeout_falls_back():
+    server = StubLLMServer(token_delay=0.5)
+    _, results, _ = run(_evaluate(server, ["slow answer"], timeout=0.2, max_retries=0))
+    assert results[0]["scorer"] == "keyword"
@@ -0,0 +1,37 @@
+# tests/test_question_bank.py
+import json
+
+from question_bank import QuestionBankStore, get_question_bank
+
+def test_bank_indexes_roles_and_types():
+    bank = get_question_bank()
+    programming = bank.questions(role="Software Developer", q_type="programming")
+    assert programming
+    assert all(q["type"] == "programming" and q["role"] == "Software Developer" for q in programming)
+    assert bank.find("What is an API?") is not None
+
+def test_string_entries_and_index_reuse(tmp_path):
+    source = tmp_path / "roles.json"
+    source.write_text(json.dumps({"roles": {"Tester": {"level": "Senior", "questions": [
+        "What is a test case?",
+        {"question": "Write a unit test.", "type": "programming", "tags": ["testing"]}
+    ]}}}))
+    index = str(tmp_path / "questions.index")
+
+    bank = QuestionBankStore(str(source), index).current()
+    assert bank.questions(level="Senior", q_type="definition")[0]["question"] == "What is a test case?"
+    assert [q["question"] for q in bank.questions(tag="testing")] == ["Write a unit test."]
+
+    reloaded = QuestionBankStore(str(source), index).current()
+    assert reloaded.ids(role="Tester") == bank.ids(role="Tester")
+
+def test_import_works_outside_repo(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import interview_engine; print(interview_engine.evaluate_answer('A class', 'definition', 'What is an API?')['score'] >= 0)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env=dict(os.environ, PYTHONPATH=root))
+    assert out.stdout.strip() == "True", out.stderr
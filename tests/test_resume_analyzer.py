@@ -0,0 +1,44 @@
+# tests/test_resume_analyzer.py
+import json
+import os
+
+from resume_analyzer import SkillMatcher, extract_skills
+from skill_taxonomy import SkillTaxonomy
+
+def test_word_boundaries():
+    skills = extract_skills("JavaScript developer, built nodes and MySQL schemas")
+    assert "java" not in skills
+    assert "node" not in skills
+    assert "sql" not in skills
+    assert "mysql" in skills
+
+def test_aliases_map_to_canonical():
+    skills = extract_skills("Backend in Node.js and ReactJS,\nmachine\nlearning with python3")
+    assert skills == ["node", "react", "machine learning", "python"]
+
+def test_longest_match_wins():
+    matcher = SkillMatcher({"node": ["node"], "node.js": ["node.js"]})
+    assert matcher.extract("Node.js services") == ["node.js"]
+
+def test_taxonomy_reloads_when_source_changes(tmp_path):
+    source = tmp_path / "skills.json"
+    index = tmp_path / "skills.index"
+    source.write_text(json.dumps({"skills": {"go": ["golang"]}, "question_templates": []}))
+
+    taxonomy = SkillTaxonomy(str(source), str(index), check_interval=0)
+    assert taxonomy.current().matcher.extract("golang and rust") == ["go"]
+    assert index.exists()
+
+    source.write_text(json.dumps({"skills": {"rust": ["rust"]}, "question_templates": []}))
+    os.utime(source, ns=(0, 0))  # Ensure the signature changes even on coarse clocks
+    assert taxonomy.current().matcher.extract("golang and rust") == ["rust"]
+
+def test_skills_load_outside_repo(tmp_path):
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "from resume_analyzer import extract_skills; print(extract_skills('python and sql'))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env=dict(os.environ, PYTHONPATH=root))
+    assert "python" in out.stdout, out.stderr
@@ -0,0 +1,35 @@
+# tests/test_resume_service.py
+import os
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+pytest.importorskip("docx")
+import resume_service
+from resume_service import ResumeCache
+
+def put(cache, key, taxonomy="t1"):
+    return cache.put(key, "text", ["python"], [{"question": "Q?", "type": "general"}], taxonomy)
+
+def test_version_and_taxonomy_invalidate(tmp_path, monkeypatch):
+    cache = ResumeCache(str(tmp_path))
+    put(cache, "a")
+    assert cache.get("a", "t1")["skills"] == ["python"]
+    assert cache.get("a", "t2") is None          # Taxonomy edited since
+    monkeypatch.setattr(resume_service, "CACHE_VERSION", resume_service.CACHE_VERSION + 1)
+    assert cache.get("a", "t1") is None          # Pipeline output changed
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResumeCache(str(tmp_path), max_bytes=10 ** 6)
+    put(cache, "a")
+    put(cache, "b")
+    size = os.path.getsize(tmp_path / "a.json")
+    cache.max_bytes = int(size * 2.5)            # Room for two entries
+
+    # Explicit times: b is older than a until a is read
+    os.utime(tmp_path / "a.json", (1000, 1000))
+    os.utime(tmp_path / "b.json", (2000, 2000))
+    assert cache.get("a", "t1") is not None      # a becomes the most recent
+    put(cache, "c")
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
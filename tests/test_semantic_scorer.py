@@ -0,0 +1,52 @@
+# tests/test_semantic_scorer.py
+import json
+import pytest
+
+pytest.importorskip("numpy")
+from semantic_scorer import SemanticScorer
+
+QUESTION = "What is overfitting?"
+
+@pytest.fixture
+def scorer(tmp_path):
+    refs = tmp_path / "refs.json"
+    refs.write_text(json.dumps({QUESTION: [
+        "Overfitting is when a model memorizes the training data and fails to generalize to new data."
+    ]}))
+    return SemanticScorer(str(refs), str(tmp_path / "index"))
+
+def test_paraphrase_beats_keyword_stuffing(scorer):
+    good = scorer.evaluate("The model memorizes training examples and does not generalize.", "definition", QUESTION)
+    stuffed = scorer.evaluate("class method data learning program object-oriented", "definition", QUESTION)
+    assert good["scorer"] == "semantic"
+    assert good["score"] > stuffed["score"]
+
+def test_falls_back_without_reference(scorer):
+    result = scorer.evaluate("A class has methods", "definition", "Unknown question?")
+    assert result["scorer"] == "keyword"
+
+def test_latency_budget_fallback(scorer):
+    scorer.budget_ms = 0
+    result = scorer.evaluate("The model memorizes training data.", "definition", QUESTION)
+    assert result["fallback_reason"] == "latency budget"
+
+def test_default_index_loads_outside_repo(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "from semantic_scorer import get_semantic_scorer; print(get_semantic_scorer() is not None)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env=dict(os.environ, PYTHONPATH=root))
+    assert out.stdout.strip().endswith("True"), out.stderr
+
+def test_every_spoken_bank_question_has_references():
+    from question_bank import get_question_bank
+    from semantic_scorer import REFERENCE_FILE
+
+    with open(REFERENCE_FILE, "r", encoding="utf-8") as f:
+        references = json.load(f)
+    missing = [q["question"] for q in get_question_bank().questions()
+               if q["type"] != "programming" and not references.get(q["question"])]
+    assert missing == []
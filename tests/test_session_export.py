@@ -0,0 +1,58 @@
+# tests/test_session_export.py
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from session_export import SessionArchive
+
+def write_session(folder, name, role, scores):
+    session = {
+        "role": role,
+        "start_time": "2026-01-02_10-00-00",
+        "questions": [{"question": f"Q{i}", "type": "definition", "answer": "some words here",
+                       "score": score} for i, score in enumerate(scores)]
+    }
+    (folder / f"session_{name}.json").write_text(json.dumps(session))
+
+def test_export_append_and_query(tmp_path):
+    sessions = tmp_path / "sessions"
+    sessions.mkdir()
+    write_session(sessions, "a", "Data Analyst", [2, 4])
+    write_session(sessions, "b", "Software Developer", [10])
+
+    archive = SessionArchive(str(tmp_path / "archive"))
+    assert archive.append(str(sessions), workers=1) == (2, 3)
+    assert archive.append(str(sessions), workers=1) == (0, 0)
+
+    write_session(sessions, "c", "Data Analyst", [6])
+    assert archive.append(str(sessions), workers=1) == (1, 1)
+    archive.compact()
+
+    reopened = SessionArchive(str(tmp_path / "archive"))
+    assert len(reopened.manifest["parts"]) == 1
+    assert reopened.mean_score_by("role")["Data Analyst"] == (3, 4.0)
+    assert reopened.count(role="Data Analyst", score_range=(4, 10)) == 2
+    assert reopened.score_histogram()[10] == 1
+    assert reopened.session_totals().tolist() == [6, 10, 6]
+
+def test_identical_sessions_count_separately_and_moves_are_skipped(tmp_path):
+    from session_manager import SessionManager
+    sessions = tmp_path / "sessions"
+    sessions.mkdir()
+    for _ in range(3):
+        session = SessionManager("Data Analyst", session_dir=str(sessions), journal=False)
+        session.start_time = "2026-01-02_10-00-00"
+        session.add_question("What is a mean?", "The average", 7, "Neutral")
+        session.add_question("What is a median?", "The middle", 5, "Neutral")
+        session.save_session()
+
+    archive = SessionArchive(str(tmp_path / "archive"))
+    assert archive.append(str(sessions), workers=1) == (3, 6)
+
+    moved = tmp_path / "moved"
+    sessions.rename(moved)
+    (moved / "session_broken.json").write_text("{not json")
+    assert archive.append(str(moved), workers=1) == (0, 0)
+    assert len(archive.manifest["parts"]) == 1
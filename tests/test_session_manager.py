@@ -0,0 +1,69 @@
+# tests/test_session_manager.py
+import json
+import os
+import time
+
+from session_manager import SessionManager
+
+def test_journal_recovers_unsaved_session(tmp_path):
+    session = SessionManager("Data Analyst", session_dir=str(tmp_path))
+    session.add_question("What is data cleaning?", "Fixing bad rows", 6, "Neutral")
+    session.add_question("What is normalization?", "Scaling values", 4, "Happy")
+    session.close()  # Simulated crash: never saved
+
+    # A torn write at the end of the journal is ignored
+    with open(session.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"event": "answer", "quest')
+
+    recovered, = SessionManager.recover(str(tmp_path))
+    assert recovered.role == "Data Analyst"
+    assert recovered.total_score() == 10
+    assert len(recovered.questions) == 2
+
+    recovered.add_question("What is a mean?", "The average", 7, "Neutral")
+    path = recovered.save_session()
+    assert not os.path.exists(recovered.journal_path)
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["total_score"] == 17
+    assert saved["questions_answered"] == 3
+
+def test_store_backend_and_role_queries(tmp_path):
+    from session_store import SessionStore
+
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    for score in (4, 8):
+        session = SessionManager("Data Analyst", session_dir=str(tmp_path), store=store)
+        session.add_camera_sample(7, "Confident")
+        session.add_question("What is data cleaning?", "Fixing bad rows", score, "Neutral")
+        session.save_session()
+
+    # Same-second sessions get distinct IDs; JSON files import alongside
+    legacy = SessionManager("Software Developer", session_dir=str(tmp_path), journal=False)
+    legacy.add_question("What is an API?", "An interface", 6, "Happy")
+    legacy.save_session()
+    assert store.import_json(str(tmp_path)) == (1, 0)
+    assert store.import_json(str(tmp_path)) == (0, 0)
+
+    averages = {row["role"]: row for row in store.role_averages()}
+    assert averages["Data Analyst"]["sessions"] == 2
+    assert averages["Data Analyst"]["avg_score"] == 6
+    assert averages["Software Developer"]["avg_total"] == 6
+    assert store.role_trend("Data Analyst")[0]["sessions"] == 2
+    store.close()
+
+def test_same_second_sessions_and_timed_fsync(tmp_path, monkeypatch):
+    import session_manager
+    monkeypatch.setattr(session_manager, "FSYNC_INTERVAL", 0.05)
+    first = SessionManager("Data Analyst", session_dir=str(tmp_path))
+    second = SessionManager("Data Analyst", session_dir=str(tmp_path))
+    second.start_time = first.start_time
+    assert first.journal_path != second.journal_path
+
+    first.add_question("What is a mean?", "The average", 7, "Neutral")
+    first._journal.append({"event": "note"})  # Inside the interval: left to the timer
+    deadline = time.monotonic() + 2
+    while first._journal._unsynced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert first._journal._unsynced == 0
+    first.close()
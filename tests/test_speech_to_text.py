@@ -0,0 +1,61 @@
+# tests/test_speech_to_text.py
+import math
+import struct
+import threading
+import wave
+from array import array
+
+import pytest
+
+sr = pytest.importorskip("speech_recognition")
+from speech_to_text import BackgroundListener, RecognizerBackend
+
+RATE = 16000
+
+def write_fixture(path):
+    """Silence (for calibration), one second of 'speech' (a loud tone), silence"""
+    samples = [0] * int(0.6 * RATE)
+    samples += [int(8000 * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(RATE)]
+    samples += [0] * int(1.5 * RATE)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+class ToneBackend(RecognizerBackend):
+    """Hears 'hello' in any chunk that contains the tone"""
+
+    name = "tone"
+
+    def transcribe(self, recognizer, audio):
+        pcm = array("h", audio.get_raw_data(convert_rate=RATE, convert_width=2))
+        return "hello" if max(map(abs, pcm), default=0) > 4000 else ""
+
+def test_backend_must_implement_transcribe():
+    with pytest.raises(TypeError):
+        RecognizerBackend()
+
+def test_wav_through_listener_waits_for_final(tmp_path):
+    path = tmp_path / "answer.wav"
+    write_fixture(path)
+    listener = BackgroundListener(backend=ToneBackend(), microphone=sr.AudioFile(str(path)))
+
+    heard = threading.Event()
+    finals = []
+    done = threading.Event()
+    session = listener.start(on_partial=lambda text, s: heard.set())
+    assert heard.wait(timeout=10)
+
+    def on_final(text, s):
+        finals.append((text, s))
+        done.set()
+
+    assert listener.stop(on_final=on_final) == session
+    assert done.wait(timeout=10)
+    assert finals == [("hello", session)]
+
+    # The next answer starts a new session with an empty transcript
+    assert listener.start() == session + 1
+    assert listener.transcript == ""
+    listener.close()
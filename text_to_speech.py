@@ -0,0 +1,216 @@
+# text_to_speech.py
+
+import itertools
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import traceback
+
+import pyttsx3
+
+try:
+    import winsound  # Plays pre-synthesized WAV files (Windows only)
+except ImportError:
+    winsound = None
+
+# Job priorities: speech always goes before background synthesis
+_PRIORITY_SPEAK = 0
+_PRIORITY_SYNTH = 1
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# -------------------------
+# Utterance handle
+# -------------------------
+class Utterance:
+    """A queued piece of speech that can be cancelled before or while it plays"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text, on_done=None):
+        self.id = next(self._ids)
+        self.text = text
+        self.on_done = on_done      # Called as on_done(utterance, completed)
+        self.cancelled = False
+        self.completed = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+# -------------------------
+# Speech Queue
+# -------------------------
+class SpeechQueue:
+    """
+    Dedicated text-to-speech worker.
+    The pyttsx3 engine lives on its own thread so speaking never blocks
+    the Tk main thread. Completion callbacks run on the worker thread;
+    UI code should hop back with widget.after(0, ...).
+    """
+
+    def __init__(self, presynthesize=True):
+        # Pre-synthesis needs a way to play WAV files back
+        self.presynthesize_enabled = presynthesize and winsound is not None
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._engine = None
+        self._current = None
+        self._lock = threading.Lock()
+        self._audio = {}             # text -> pre-synthesized WAV path
+        self._audio_dir = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def say(self, text, on_done=None, interrupt=False):
+        """
+        Queue text for speaking and return its Utterance.
+        interrupt=True cancels everything queued or playing first.
+        """
+        if interrupt:
+            self.cancel_all()
+        utterance = Utterance(text, on_done)
+        self._queue.put((_PRIORITY_SPEAK, next(self._order), "speak", utterance))
+        return utterance
+
+    def presynthesize(self, text):
+        """Render text to audio in the background so a later say() starts instantly"""
+        if not self.presynthesize_enabled or not text:
+            return
+        with self._lock:
+            if text in self._audio:
+                return
+        self._queue.put((_PRIORITY_SYNTH, next(self._order), "synth", text))
+
+    def skip(self):
+        """Stop the utterance that is currently playing"""
+        with self._lock:
+            current = self._current
+        if current is not None:
+            current.cancel()
+            self._stop_playback()
+
+    def cancel_all(self):
+        """Cancel every queued utterance and stop the current one"""
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        for item in pending:
+            if item[2] == "speak":
+                item[3].cancel()
+                self._discard_audio(item[3].text)
+                self._finish(item[3])
+            else:
+                self._queue.put(item)  # Keep background synthesis jobs
+
+        self.skip()
+
+    def is_speaking(self):
+        with self._lock:
+            return self._current is not None
+
+    def shutdown(self):
+        """Stop speaking and end the worker thread"""
+        self.cancel_all()
+        self._queue.put((_PRIORITY_SPEAK, next(self._order), "quit", None))
+
+    # -------------------------
+    # Worker thread
+    # -------------------------
+    def _run(self):
+        self._engine = pyttsx3.init()
+        # Cancellation is applied from inside the engine's own callback
+        self._engine.connect("started-word", self._on_word)
+
+        while True:
+            _, _, kind, payload = self._queue.get()
+            if kind == "quit":
+                self._remove_audio_dir()
+                break
+            try:
+                if kind == "speak":
+                    self._speak(payload)
+                elif kind == "synth":
+                    self._synthesize(payload)
+            except Exception as e:
+                print("[TTS] Error:", e)
+                traceback.print_exc()
+
+    def _on_word(self, name, location, length):
+        with self._lock:
+            current = self._current
+        if current is not None and current.cancelled:
+            self._engine.stop()
+
+    def _speak(self, utterance):
+        if utterance.cancelled:
+            self._discard_audio(utterance.text)
+            self._finish(utterance)
+            return
+
+        with self._lock:
+            self._current = utterance
+            wav_path = self._audio.pop(utterance.text, None)
+
+        try:
+            if wav_path and os.path.exists(wav_path):
+                winsound.PlaySound(wav_path, winsound.SND_FILENAME)
+            else:
+                self._engine.say(utterance.text)
+                self._engine.runAndWait()
+            utterance.completed = not utterance.cancelled
+        finally:
+            with self._lock:
+                self._current = None
+            if wav_path:
+                _remove_file(wav_path)
+            self._finish(utterance)
+
+    def _synthesize(self, text):
+        if self._audio_dir is None:
+            self._audio_dir = tempfile.mkdtemp(prefix="interview_tts_")
+        path = os.path.join(self._audio_dir, f"utt_{next(self._order)}.wav")
+        self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+        with self._lock:
+            self._audio[text] = path
+
+    def _discard_audio(self, text):
+        """Delete the pre-synthesized WAV of an utterance that will not be played"""
+        with self._lock:
+            wav_path = self._audio.pop(text, None)
+        if wav_path:
+            _remove_file(wav_path)
+
+    def _remove_audio_dir(self):
+        with self._lock:
+            self._audio.clear()
+        if self._audio_dir is not None:
+            shutil.rmtree(self._audio_dir, ignore_errors=True)
+
+    def _stop_playback(self):
+        if winsound is not None:
+            winsound.PlaySound(None, 0)  # Stops any WAV that is playing
+
+    def _finish(self, utterance):
+        if utterance.on_done:
+            try:
+                utterance.on_done(utterance, utterance.completed)
+            except Exception as e:
+                print("[TTS] Callback error:", e)
+                traceback.print_exc()